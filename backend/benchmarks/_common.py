@@ -0,0 +1,84 @@
+"""
+Shared helpers for the benchmark scripts: temp database setup, the light
+endpoint client loop and latency percentiles
+"""
+
+import os
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(BACKEND_DIR)
+
+# Cheap endpoints whose latency shows whether other work stalls the event loop
+LIGHT_ENDPOINTS = [
+    "/health",
+    "/community/posts?limit=20",
+    "/chat/history/1?limit=10",
+    "/meetups/list",
+]
+
+
+def use_temp_databases(tmp_dir: str):
+    """
+    Point the app at tmp_dir/sakhi.db and tmp_dir/translation_cache.db
+    Call before importing anything from the backend, so the tracked
+    databases are never opened
+    """
+    os.environ["SAKHI_DB_PATH"] = os.path.join(tmp_dir, "sakhi.db")
+    os.environ["SAKHI_TRANSLATION_CACHE_DB"] = os.path.join(tmp_dir, "translation_cache.db")
+    # Use litellm's bundled model cost map instead of fetching it at import time
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    os.chdir(BACKEND_DIR)
+    for path in (BACKEND_DIR, PROJECT_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LightLoad:
+    """Latencies (ms) of clients cycling through LIGHT_ENDPOINTS, plus an error count"""
+
+    def __init__(self):
+        self.latencies = {path: [] for path in LIGHT_ENDPOINTS}
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def count_error(self):
+        with self.lock:
+            self.errors += 1
+
+    def client(self, client, deadline: float, n: int):
+        """Thread target: request light endpoints until the deadline (time.monotonic)"""
+        i = n
+        while time.monotonic() < deadline:
+            path = LIGHT_ENDPOINTS[i % len(LIGHT_ENDPOINTS)]
+            i += 1
+            started = time.perf_counter()
+            status = client.get(path).status_code
+            elapsed = (time.perf_counter() - started) * 1000
+            with self.lock:
+                self.latencies[path].append(elapsed)
+                if status != 200:
+                    self.errors += 1
+
+    def rows(self):
+        """(label, latencies) per endpoint and for all light requests together"""
+        every = [value for values in self.latencies.values() for value in values]
+        return list(self.latencies.items()) + [("all light requests", every)]
+
+
+def print_latency_table(rows):
+    """Print count and p50/p95/p99 for (label, latencies in ms) rows"""
+    print(f"{'endpoint':32} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, values in rows:
+        print(f"{label:32} {len(values):6d} {percentile(values, 50):8.1f} "
+              f"{percentile(values, 95):8.1f} {percentile(values, 99):8.1f}")
@@ -0,0 +1,120 @@
+"""
+Chatbot load benchmark against a fake local LLM
+
+Starts an OpenAI-compatible fake LLM in a background thread that answers
+after a fixed delay, points the shared LLM client at it, and runs the app
+in-process against a copy of data/sakhi.db and a fresh translation cache
+in a temp dir (the tracked databases are never touched). "Chat" clients
+keep asking unique questions through /chat/ask while "light" clients hit
+the cheap endpoints; if LLM calls blocked the event loop, the light
+endpoints would wait for every answer.
+
+Usage (from backend/):
+    python benchmarks/llm_load.py [--delay 2] [--seconds 10] [--chat 8] [--light 8]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _common import PROJECT_DIR, LightLoad, print_latency_table, use_temp_databases
+
+
+def start_fake_llm(delay: float) -> ThreadingHTTPServer:
+    """OpenAI-compatible /chat/completions that sleeps `delay` seconds per call"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['content-length'])))
+            time.sleep(delay)
+            payload = json.dumps({
+                "id": "fake", "object": "chat.completion", "created": 0, "model": "fake",
+                "choices": [{
+                    "index": 0, "finish_reason": "stop",
+                    "message": {"role": "assistant",
+                                "content": "Fake answer to: " + body['messages'][-1]['content'][-40:]}
+                }],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+            }).encode()
+            self.send_response(200)
+            self.send_header('content-type', 'application/json')
+            self.send_header('content-length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=2, help="seconds the fake LLM takes per answer")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--chat", type=int, default=8, help="clients asking the chatbot")
+    parser.add_argument("--light", type=int, default=8, help="clients hitting cheap endpoints")
+    args = parser.parse_args()
+
+    server = start_fake_llm(args.delay)
+    tmp_dir = tempfile.mkdtemp(prefix="sakhi-bench-")
+    shutil.copy(os.path.join(PROJECT_DIR, "data", "sakhi.db"), os.path.join(tmp_dir, "sakhi.db"))
+    use_temp_databases(tmp_dir)
+    os.environ.update({
+        "SAKHI_LLM_MODEL": "openai/fake",
+        "SAKHI_LLM_API_BASE": f"http://127.0.0.1:{server.server_port}/v1",
+        "SAKHI_LLM_API_KEY": "fake",
+    })
+
+    from fastapi.testclient import TestClient
+    import main as app_module
+
+    light = LightLoad()
+    chat_latencies = []
+    ai_answers = [0]
+    question_ids = itertools.count()
+    lock = threading.Lock()
+
+    with TestClient(app_module.app) as client:
+        deadline = time.monotonic() + args.seconds
+
+        def chat_client(n):
+            while time.monotonic() < deadline:
+                # Unique questions, so every one reaches the LLM instead of the response cache
+                question = f"Benchmark question {next(question_ids)} about cycle length"
+                started = time.perf_counter()
+                response = client.post(f"/chat/ask?user_id={n % 4 + 1}",
+                                       json={"question": question, "language": "en"})
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    chat_latencies.append(elapsed)
+                    if response.status_code != 200:
+                        light.count_error()
+                    elif response.json().get('ai_powered'):
+                        ai_answers[0] += 1
+
+        threads = [threading.Thread(target=chat_client, args=(n,)) for n in range(args.chat)]
+        threads += [threading.Thread(target=light.client, args=(client, deadline, n)) for n in range(args.light)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    server.shutdown()
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\nfake LLM delay {args.delay:.1f}s, {args.chat} chat + {args.light} light clients, {args.seconds:.0f}s")
+    print(f"chat requests: {len(chat_latencies)} ({ai_answers[0]} answered by the LLM), errors: {light.errors}")
+    print_latency_table([("/chat/ask", chat_latencies)] + light.rows())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Meetup list query benchmark
+
+Seeds a copy of data/sakhi.db (the tracked databases are never touched)
+with one city full of meetups, participants and stars, then times the
+per-meetup lookups GET /meetups/list used to run (one COUNT and two
+membership checks per meetup) against the single MEETUPS_BY_CITY_SQL
+statement the route runs now.
+
+Usage (from backend/):
+    python benchmarks/meetups_list.py [--meetups 10000] [--participants 5] [--stars 2] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from _common import PROJECT_DIR, use_temp_databases
+
+CITY = "Benchmark City"
+
+
+def prepare_database(meetups: int, participants: int, stars: int):
+    """Copy the sample database to a temp dir and fill one city with meetups"""
+    tmp_dir = tempfile.mkdtemp(prefix="sakhi-bench-")
+    db_path = os.path.join(tmp_dir, "sakhi.db")
+    shutil.copy(os.path.join(PROJECT_DIR, "data", "sakhi.db"), db_path)
+
+    conn = sqlite3.connect(db_path)
+    user_ids = [
+        conn.execute("INSERT INTO users (name, language_pref, city) VALUES (?, 'en', ?)",
+                     (f"Benchmark User {i}", CITY)).lastrowid
+        for i in range(max(participants, stars) * 4)
+    ]
+    first_id = None
+    for i in range(meetups):
+        meetup_id = conn.execute(
+            '''INSERT INTO meetups (title, description, city, date, time, created_by)
+               VALUES (?, 'benchmark', ?, date('2030-01-01', ?), '18:00', ?)''',
+            (f"Meetup {i}", CITY, f"+{i % 365} days", user_ids[0])
+        ).lastrowid
+        first_id = first_id or meetup_id
+    rng = random.Random(0)
+    meetup_ids = range(first_id, first_id + meetups)
+    conn.executemany(
+        "INSERT INTO meetup_participants (meetup_id, user_id) VALUES (?, ?)",
+        ((meetup_id, user_id) for meetup_id in meetup_ids
+         for user_id in rng.sample(user_ids, participants))
+    )
+    conn.executemany(
+        "INSERT INTO meetup_stars (meetup_id, user_id) VALUES (?, ?)",
+        ((meetup_id, user_id) for meetup_id in meetup_ids
+         for user_id in rng.sample(user_ids, stars))
+    )
+    conn.commit()
+    conn.close()
+    return db_path, user_ids[0]
+
+
+def per_meetup_lookups(conn, user_id):
+    """What the route ran before: the meetups, then three lookups per meetup"""
+    meetups = []
+    for row in conn.execute('SELECT * FROM meetups WHERE city = ? ORDER BY date ASC', (CITY,)).fetchall():
+        meetup = dict(row)
+        meetup['participants_count'] = conn.execute(
+            'SELECT COUNT(*) as count FROM meetup_participants WHERE meetup_id = ?', (meetup['id'],)
+        ).fetchone()['count']
+        meetup['user_joined'] = conn.execute(
+            'SELECT * FROM meetup_participants WHERE meetup_id = ? AND user_id = ?', (meetup['id'], user_id)
+        ).fetchone() is not None
+        meetup['user_starred'] = conn.execute(
+            'SELECT * FROM meetup_stars WHERE meetup_id = ? AND user_id = ?', (meetup['id'], user_id)
+        ).fetchone() is not None
+        meetups.append(meetup)
+    return meetups
+
+
+def single_query(conn, user_id, sql):
+    """What the route runs now"""
+    rows = conn.execute(sql, {'user_id': user_id, 'city': CITY}).fetchall()
+    return [dict(row) for row in rows]
+
+
+def best_of(repeat, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetups", type=int, default=10000)
+    parser.add_argument("--participants", type=int, default=5, help="participants per meetup")
+    parser.add_argument("--stars", type=int, default=2, help="stars per meetup")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    db_path, user_id = prepare_database(args.meetups, args.participants, args.stars)
+    use_temp_databases(os.path.dirname(db_path))
+
+    # Imported after the environment points at the temp databases
+    from routes.meetups import MEETUPS_BY_CITY_SQL
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    old_time, old_rows = best_of(args.repeat, per_meetup_lookups, conn, user_id)
+    new_time, new_rows = best_of(args.repeat, single_query, conn, user_id, MEETUPS_BY_CITY_SQL)
+    conn.close()
+    shutil.rmtree(os.path.dirname(db_path), ignore_errors=True)
+
+    same = [(m['id'], m['participants_count'], m['user_joined'], m['user_starred']) for m in old_rows] == \
+        [(m['id'], m['participants_count'], bool(m['user_joined']), bool(m['user_starred'])) for m in new_rows]
+
+    print(f"\n{args.meetups} meetups, {args.participants} participants and {args.stars} stars each, "
+          f"best of {args.repeat}")
+    print(f"{'variant':28} {'statements':>10} {'seconds':>9}")
+    print(f"{'per-meetup lookups (old)':28} {1 + 3 * len(old_rows):10d} {old_time:9.3f}")
+    print(f"{'MEETUPS_BY_CITY_SQL (new)':28} {1:10d} {new_time:9.3f}")
+    print(f"speedup: {old_time / new_time:.1f}x, same results: {same}")
+
+
+if __name__ == "__main__":
+    main()
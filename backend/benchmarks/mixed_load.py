@@ -0,0 +1,103 @@
+"""
+Mixed-load latency benchmark for the Sakhi API
+
+Runs the app in-process against a copy of data/sakhi.db and a fresh
+translation cache in a temp dir (the tracked databases are never touched).
+"Heavy" clients keep fetching a user with a large period history while
+"light" clients hit the cheap endpoints; latency percentiles for the light
+endpoints show whether slow queries stall the event loop.
+
+Usage (from backend/):
+    python benchmarks/mixed_load.py [--rows 20000] [--seconds 10] [--heavy 4] [--light 8]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from _common import PROJECT_DIR, LightLoad, print_latency_table, use_temp_databases
+
+HEAVY_ENDPOINTS = [
+    "/period/logs/{user_id}",
+    "/period/analytics/{user_id}",
+]
+
+
+def prepare_database(rows: int):
+    """Copy the sample database to a temp dir and give one user `rows` period logs"""
+    tmp_dir = tempfile.mkdtemp(prefix="sakhi-bench-")
+    db_path = os.path.join(tmp_dir, "sakhi.db")
+    shutil.copy(os.path.join(PROJECT_DIR, "data", "sakhi.db"), db_path)
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.execute(
+        "INSERT INTO users (name, language_pref, city) VALUES ('Benchmark User', 'en', 'Bangalore')"
+    )
+    user_id = cursor.lastrowid
+    start = date(2000, 1, 1)
+    conn.executemany(
+        '''INSERT INTO period_logs (user_id, start_date, end_date, flow_level, symptoms, notes)
+           VALUES (?, ?, ?, 2, 'cramps', 'benchmark')''',
+        (
+            (user_id, (start + timedelta(days=28 * i)).isoformat(),
+             (start + timedelta(days=28 * i + 4)).isoformat())
+            for i in range(rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+    return db_path, user_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="period logs for the heavy user")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--heavy", type=int, default=4, help="clients fetching the large history")
+    parser.add_argument("--light", type=int, default=8, help="clients hitting cheap endpoints")
+    args = parser.parse_args()
+
+    db_path, user_id = prepare_database(args.rows)
+    use_temp_databases(os.path.dirname(db_path))
+
+    from fastapi.testclient import TestClient
+    import main as app_module
+
+    light = LightLoad()
+    heavy_calls = [0]
+    lock = threading.Lock()
+
+    with TestClient(app_module.app) as client:
+        deadline = time.monotonic() + args.seconds
+
+        def heavy_client(n):
+            i = n
+            while time.monotonic() < deadline:
+                path = HEAVY_ENDPOINTS[i % len(HEAVY_ENDPOINTS)].format(user_id=user_id)
+                i += 1
+                if client.get(path).status_code != 200:
+                    light.count_error()
+                with lock:
+                    heavy_calls[0] += 1
+
+        threads = [threading.Thread(target=heavy_client, args=(n,)) for n in range(args.heavy)]
+        threads += [threading.Thread(target=light.client, args=(client, deadline, n)) for n in range(args.light)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    shutil.rmtree(os.path.dirname(db_path), ignore_errors=True)
+
+    print(f"\n{args.rows} period logs, {args.heavy} heavy + {args.light} light clients, {args.seconds:.0f}s")
+    print(f"heavy requests: {heavy_calls[0]}, errors: {light.errors}")
+    print_latency_table(light.rows())
+
+
+if __name__ == "__main__":
+    main()
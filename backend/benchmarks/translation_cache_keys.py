@@ -0,0 +1,147 @@
+"""
+Translation cache key benchmark: source text vs 64-bit content hash
+
+Builds two throwaway cache databases with the same rows, one in the old
+layout (UNIQUE(source_text, source_lang, target_lang) plus the duplicate
+idx_translation_lookup) and one from the current CACHE_TABLE_SCHEMA keyed
+by text_hash, then compares warm lookup time, index size and file size.
+Nothing outside a temp dir is touched.
+
+Usage (from backend/):
+    python benchmarks/translation_cache_keys.py [--rows 1000000] [--lookups 20000] [--text-length 240]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from _common import use_temp_databases
+
+# Layout before the cache was keyed by text_hash
+TEXT_KEYED_SCHEMA = [
+    '''CREATE TABLE translation_cache (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_text TEXT,
+        source_lang TEXT,
+        target_lang TEXT,
+        translated_text TEXT,
+        provider TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        access_count INTEGER DEFAULT 1,
+        last_accessed TIMESTAMP,
+        UNIQUE(source_text, source_lang, target_lang)
+    )''',
+    'CREATE INDEX idx_translation_lookup ON translation_cache(source_text, source_lang, target_lang)',
+]
+TEXT_KEYED_LOOKUP = '''
+    SELECT translated_text FROM translation_cache
+    WHERE source_text = ? AND source_lang = ? AND target_lang = ?
+'''
+HASH_KEYED_LOOKUP = '''
+    SELECT translated_text FROM translation_cache
+    WHERE text_hash = ? AND source_lang = ? AND target_lang = ? AND source_text = ?
+'''
+# Eviction indexes both layouts have
+EVICTION_INDEXES = [
+    'CREATE INDEX idx_translation_lfu ON translation_cache(access_count, last_accessed)',
+    'CREATE INDEX idx_translation_lru ON translation_cache(last_accessed, access_count)',
+]
+WORDS = ("period cramps cycle pain doctor sleep mood hormone flow week month "
+         "yoga diet iron tired help advice normal heavy late early").split()
+
+
+def make_text(rng, index, length):
+    """A post-like text of about `length` characters, unique per index"""
+    words = [f"#{index}"]
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(rng.choice(WORDS))
+    return " ".join(words)
+
+
+def build(path, schema, rows, text_length, with_hash):
+    conn = sqlite3.connect(path)
+    for statement in schema + EVICTION_INDEXES:
+        conn.execute(statement)
+    rng = random.Random(0)
+    batch = []
+    for i in range(rows):
+        text = make_text(rng, i, text_length)
+        row = (text, 'en', 'hi', "translated " + text, 'google')
+        batch.append((with_hash(text), *row) if with_hash else row)
+        if len(batch) == 10000 or i == rows - 1:
+            if with_hash:
+                conn.executemany('''INSERT INTO translation_cache
+                    (text_hash, source_text, source_lang, target_lang, translated_text, provider)
+                    VALUES (?, ?, ?, ?, ?, ?)''', batch)
+            else:
+                conn.executemany('''INSERT INTO translation_cache
+                    (source_text, source_lang, target_lang, translated_text, provider)
+                    VALUES (?, ?, ?, ?, ?)''', batch)
+            batch = []
+    conn.commit()
+    conn.execute('VACUUM')
+    return conn
+
+
+def index_sizes(conn):
+    """{index name: bytes} for every index on translation_cache"""
+    return dict(conn.execute('''
+        SELECT name, SUM(pgsize) FROM dbstat
+        WHERE name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'translation_cache')
+        GROUP BY name
+    ''').fetchall())
+
+
+def time_lookups(conn, sql, make_key, texts):
+    """Seconds per lookup and number of hits; building the key (hashing) is timed too"""
+    started = time.perf_counter()
+    hits = sum(conn.execute(sql, make_key(text)).fetchone() is not None for text in texts)
+    return (time.perf_counter() - started) / len(texts), hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--text-length", type=int, default=240, help="characters per source text")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="sakhi-bench-")
+    use_temp_databases(tmp_dir)
+
+    # Imported after the environment points at the temp dir
+    from backend.services.translation_service import CACHE_TABLE_SCHEMA, text_hash
+
+    variants = [
+        ("text key (old)", TEXT_KEYED_SCHEMA, None, TEXT_KEYED_LOOKUP,
+         lambda text: (text, 'en', 'hi')),
+        ("hash key (new)", [CACHE_TABLE_SCHEMA.format(table='translation_cache')], text_hash, HASH_KEYED_LOOKUP,
+         lambda text: (text_hash(text), 'en', 'hi', text)),
+    ]
+    # build() generates the same texts from the same seed
+    text_rng = random.Random(0)
+    texts = [make_text(text_rng, i, args.text_length) for i in range(args.rows)]
+    sample = [texts[i] for i in random.Random(1).sample(range(args.rows), min(args.lookups, args.rows))]
+
+    print(f"\n{args.rows} rows of ~{args.text_length}-char texts, {len(sample)} random warm lookups")
+    print(f"{'layout':16} {'us/lookup':>10} {'hits':>7} {'key index MB':>13} {'all indexes MB':>15} {'file MB':>8}")
+    for label, schema, hash_fn, lookup, make_key in variants:
+        path = os.path.join(tmp_dir, f"{label.split()[0]}.db")
+        conn = build(path, schema, args.rows, args.text_length, hash_fn)
+        time_lookups(conn, lookup, make_key, sample)  # warm the page cache
+        per_lookup, hits = time_lookups(conn, lookup, make_key, sample)
+        sizes = index_sizes(conn)
+        key_bytes = sum(size for name, size in sizes.items() if 'lfu' not in name and 'lru' not in name)
+        conn.close()
+        print(f"{label:16} {per_lookup * 1e6:10.1f} {hits:7d} {key_bytes / 2**20:13.1f} "
+              f"{sum(sizes.values()) / 2**20:15.1f} {os.path.getsize(path) / 2**20:8.1f}")
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
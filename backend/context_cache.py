@@ -0,0 +1,65 @@
+"""
+Per-user health context cache for chatbot prompts
+The rendered context only changes when the user logs health data or posts,
+so it is built once and reused across turns until one of those writes
+invalidates it
+"""
+
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.lru_cache import LRUCache
+
+
+class UserContextCache:
+    """
+    Context snapshots keyed by user, with a per-user version number
+
+    invalidate() bumps the user's version, so a snapshot built from data read
+    before a write can never be stored after it.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = 3600):
+        self.cache = LRUCache(max_size=max_size, ttl=ttl)
+        self._versions = {}  # user_id -> number of invalidations
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def version(self, user_id: int) -> int:
+        """Current version for user_id; read it before fetching the data"""
+        return self._versions.get(user_id, 0)
+
+    def get(self, user_id: int) -> Optional[str]:
+        """Cached context for user_id, or None"""
+        return self.cache.get(user_id)
+
+    def store(self, user_id: int, context: str, version: int):
+        """Cache a context unless the user's data changed since `version` was read"""
+        with self._lock:
+            if version == self._versions.get(user_id, 0):
+                self.cache.set(user_id, context)
+
+    def invalidate(self, user_id: int):
+        """Drop the user's snapshot (call after writing data the context uses)"""
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self.invalidations += 1
+            self.cache.delete(user_id)
+
+    def get_stats(self) -> Dict:
+        return {
+            'invalidations': self.invalidations,
+            'store': self.cache.get_stats()
+        }
+
+
+# Global instance
+context_cache = UserContextCache(
+    max_size=int(os.getenv("SAKHI_CONTEXT_CACHE_SIZE", "1000")),
+    ttl=float(os.getenv("SAKHI_CONTEXT_CACHE_TTL", "3600"))
+)
@@ -3,306 +3,422 @@ Database configuration and initialization for Sakhi App
 Uses SQLite for local development and demo
 """
 
+import asyncio
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import os
+import queue
 import random
+import threading
+import time
+import traceback
+
+from migrations import run_migrations
+
+
+# SQLite pragma profiles applied to every pooled connection.
+# "performance" lets readers proceed while a write is in progress (WAL) and
+# keeps hot pages in memory; "safe" trades write speed for full fsync durability.
+PRAGMA_PROFILES = {
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,        # ms to wait on a locked database before failing
+        "cache_size": -16000,        # negative = KiB, ~16 MB page cache per connection
+        "mmap_size": 134217728,      # 128 MB memory-mapped reads
+        "temp_store": "MEMORY",
+    },
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 10000,
+    },
+}
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of SQLite connections
+
+    Connections are checked out with the `connection()` context manager and
+    returned automatically. A thread that already holds a connection gets the
+    same one back on nested checkouts, so helpers can share a transaction.
+    """
+
+    def __init__(self, connect, size=5, timeout=10.0, leak_threshold=30.0):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.leak_threshold = leak_threshold
+
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._created = 0
+        self._checked_out = {}  # id(conn) -> (checkout time, thread name, stack)
+
+        # Metrics
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._saturated = 0
+        self._timeouts = 0
+        self._leaks = 0
+
+    def _acquire(self):
+        """Take an idle connection, open a new one, or wait for a checkin"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+            self._saturated += 1
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(
+                f"No database connection available after {self.timeout}s "
+                f"(pool size {self.size})"
+            )
+
+    def _release(self, conn):
+        """Return a connection to the pool, reporting it if it was held too long"""
+        with self._lock:
+            checked_out_at, thread_name, stack = self._checked_out.pop(id(conn))
+        held = time.monotonic() - checked_out_at
+        if held > self.leak_threshold:
+            with self._lock:
+                self._leaks += 1
+            print(f"Warning: database connection held for {held:.1f}s by {thread_name}, checked out at:\n{stack}")
+
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of the block
+
+        Commits when the block finishes cleanly and rolls back on error.
+        Nested checkouts on the same thread reuse the outer connection and
+        leave commit/rollback to it.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        started = time.monotonic()
+        conn = self._acquire()
+        waited = time.monotonic() - started
+
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            self._checked_out[id(conn)] = (
+                time.monotonic(),
+                threading.current_thread().name,
+                "".join(traceback.format_stack(limit=6)[:-2]),
+            )
+
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def find_leaks(self):
+        """List connections currently held longer than the leak threshold"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {"held_seconds": round(now - checked_out_at, 1), "thread": thread_name, "stack": stack}
+                for checked_out_at, thread_name, stack in self._checked_out.values()
+                if now - checked_out_at > self.leak_threshold
+            ]
+
+    def get_stats(self):
+        """Pool usage metrics: wait times, saturation and leaks"""
+        with self._lock:
+            in_use = len(self._checked_out)
+            return {
+                "size": self.size,
+                "open_connections": self._created,
+                "in_use": in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "saturation_events": self._saturated,
+                "timeouts": self._timeouts,
+                "leaks_detected": self._leaks,
+                "utilization": f"{in_use / self.size * 100:.0f}%",
+            }
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
 
 class Database:
-    def __init__(self, db_path="data/sakhi.db"):
-        # Get project root directory
+    def __init__(self, db_path=None, pool_size=None, pool_timeout=None, pragma_profile=None):
+        # Relative paths are resolved from the project root
+        if db_path is None:
+            db_path = os.getenv("SAKHI_DB_PATH", "data/sakhi.db")
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.db_path = os.path.join(base_dir, db_path)
 
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
-        self.init_database()
+        # Pragmas applied to every new connection
+        if pragma_profile is None:
+            pragma_profile = os.getenv("SAKHI_DB_PRAGMA_PROFILE", "performance")
+        if pragma_profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown pragma profile: {pragma_profile}")
+        self.pragma_profile = pragma_profile
+        self.pragmas = PRAGMA_PROFILES[pragma_profile]
+
+        # Background WAL checkpointing (see start_checkpoint_task)
+        self._checkpoint_thread = None
+        self._checkpoint_stop = threading.Event()
+
+        # Connection pool (size and checkout timeout configurable via environment)
+        if pool_size is None:
+            pool_size = int(os.getenv("SAKHI_DB_POOL_SIZE", "5"))
+        if pool_timeout is None:
+            pool_timeout = float(os.getenv("SAKHI_DB_POOL_TIMEOUT", "10"))
+        self.pool = ConnectionPool(
+            self._create_connection,
+            size=pool_size,
+            timeout=pool_timeout,
+            leak_threshold=float(os.getenv("SAKHI_DB_LEAK_THRESHOLD", "30")),
+        )
 
-    def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        return conn
+        # Dedicated worker threads for async access, one per pooled connection,
+        # so blocking sqlite3 calls never run on the event loop
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sakhi-db")
 
-    def init_database(self):
-        """Initialize all database tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                phone TEXT UNIQUE,
-                name TEXT,
-                language_pref TEXT DEFAULT 'en',
-                city TEXT,
-                anonymous BOOLEAN DEFAULT 0,
-                age INTEGER,
-                menopause_stage TEXT CHECK(menopause_stage IN ('pre-menopause', 'early-perimenopause', 'late-perimenopause', 'menopause', 'post-menopause')) DEFAULT 'pre-menopause',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        self.init_database()
 
-        # Add menopause columns if they don't exist (for existing databases)
-        try:
-            cursor.execute("ALTER TABLE users ADD COLUMN age INTEGER")
-        except:
-            pass  # Column already exists
+    def _create_connection(self):
+        """Open a new database connection for the pool"""
+        busy_timeout = self.pragmas.get("busy_timeout", 5000) / 1000
+        conn = sqlite3.connect(self.db_path, timeout=busy_timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
 
-        try:
-            cursor.execute("ALTER TABLE users ADD COLUMN menopause_stage TEXT CHECK(menopause_stage IN ('pre-menopause', 'early-perimenopause', 'late-perimenopause', 'menopause', 'post-menopause')) DEFAULT 'pre-menopause'")
-        except:
-            pass  # Column already exists
-
-        # Period logs table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS period_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                start_date DATE NOT NULL,
-                end_date DATE,
-                flow_level INTEGER CHECK(flow_level IN (1, 2, 3)),
-                symptoms TEXT,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Community posts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                content TEXT NOT NULL,
-                language TEXT DEFAULT 'en',
-                anonymous_name TEXT,
-                upvotes INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Comments table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS comments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                post_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                content TEXT NOT NULL,
-                language TEXT DEFAULT 'en',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (post_id) REFERENCES posts(id),
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Meetups table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS meetups (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                city TEXT NOT NULL,
-                date DATE NOT NULL,
-                time TIME NOT NULL,
-                meetup_type TEXT DEFAULT 'In-Person',
-                location TEXT,
-                language TEXT DEFAULT 'English',
-                created_by INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (created_by) REFERENCES users(id)
-            )
-        ''')
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
 
-        # Add new columns if they don't exist (for existing databases)
-        try:
-            cursor.execute("ALTER TABLE meetups ADD COLUMN meetup_type TEXT DEFAULT 'In-Person'")
-        except:
-            pass  # Column already exists
+        return conn
 
-        try:
-            cursor.execute("ALTER TABLE meetups ADD COLUMN location TEXT")
-        except:
-            pass  # Column already exists
+    def connection(self):
+        """Check out a pooled connection (use as a context manager)"""
+        return self.pool.connection()
+
+    def _run_in_connection(self, fn, args, immediate=False):
+        with self.connection() as conn:
+            if immediate and not conn.in_transaction:
+                # Take the write lock up front so read-then-write work cannot
+                # fail with SQLITE_BUSY halfway through under contention
+                conn.execute('BEGIN IMMEDIATE')
+            return fn(conn, *args)
+
+    async def run(self, fn, *args):
+        """
+        Run fn(conn, *args) on a database worker thread and await the result
+
+        fn gets a pooled connection inside a single transaction (committed
+        when fn returns, rolled back if it raises), so multi-statement
+        work stays atomic without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run_in_connection, fn, args)
+
+    async def run_write(self, fn, *args):
+        """Like run(), but the transaction starts with BEGIN IMMEDIATE (for counter updates)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run_in_connection, fn, args, True)
+
+    async def fetchall(self, sql, params=()):
+        """Run a query off the event loop and return all rows"""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql, params=()):
+        """Run a query off the event loop and return the first row (or None)"""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def execute(self, sql, params=()):
+        """Run a write statement off the event loop; returns the cursor (lastrowid, rowcount)"""
+        return await self.run(lambda conn: conn.execute(sql, params))
+
+    def close(self):
+        """Stop the database worker threads and close pooled connections"""
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    def get_pool_stats(self):
+        """Get connection pool metrics"""
+        return self.pool.get_stats()
+
+    def checkpoint(self, mode="PASSIVE"):
+        """
+        Copy WAL contents back into the main database file
+
+        PASSIVE never blocks readers or writers; TRUNCATE also resets the
+        WAL file to zero bytes and is used on shutdown.
+        """
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+
+        with self.connection() as conn:
+            busy, wal_pages, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+        return {"busy": bool(busy), "wal_pages": wal_pages, "checkpointed_pages": checkpointed}
+
+    def start_checkpoint_task(self, interval=None):
+        """Start a background thread that checkpoints the WAL periodically"""
+        if self._checkpoint_thread and self._checkpoint_thread.is_alive():
+            return
 
-        try:
-            cursor.execute("ALTER TABLE meetups ADD COLUMN language TEXT DEFAULT 'English'")
-        except:
-            pass  # Column already exists
+        if interval is None:
+            interval = float(os.getenv("SAKHI_DB_CHECKPOINT_INTERVAL", "300"))
+
+        def run():
+            while not self._checkpoint_stop.wait(interval):
+                try:
+                    self.checkpoint()
+                except Exception as e:
+                    print(f"WAL checkpoint failed: {e}")
+
+        self._checkpoint_stop.clear()
+        self._checkpoint_thread = threading.Thread(target=run, name="sakhi-wal-checkpoint", daemon=True)
+        self._checkpoint_thread.start()
+
+    def stop_checkpoint_task(self):
+        """Stop the checkpoint thread and fold the WAL into the database file"""
+        self._checkpoint_stop.set()
+        if self._checkpoint_thread:
+            self._checkpoint_thread.join(timeout=5)
+            self._checkpoint_thread = None
+
+        if self.pragmas.get("journal_mode") == "WAL":
+            try:
+                self.checkpoint("TRUNCATE")
+            except Exception as e:
+                print(f"WAL checkpoint failed: {e}")
 
-        try:
-            cursor.execute("ALTER TABLE meetups ADD COLUMN stars INTEGER DEFAULT 0")
-        except:
-            pass  # Column already exists
-
-        # Meetup participants table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS meetup_participants (
-                meetup_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (meetup_id, user_id),
-                FOREIGN KEY (meetup_id) REFERENCES meetups(id),
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Post upvotes table (to track who upvoted what)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS post_upvotes (
-                post_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (post_id, user_id),
-                FOREIGN KEY (post_id) REFERENCES posts(id),
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Meetup stars table (to track who starred what)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS meetup_stars (
-                meetup_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (meetup_id, user_id),
-                FOREIGN KEY (meetup_id) REFERENCES meetups(id),
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Chat history table (for chatbot)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chat_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                question TEXT NOT NULL,
-                answer TEXT NOT NULL,
-                language TEXT DEFAULT 'en',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Menopause symptoms table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS menopause_symptoms (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                log_date DATE NOT NULL,
-                hot_flashes INTEGER DEFAULT 0 CHECK(hot_flashes >= 0),
-                night_sweats INTEGER DEFAULT 0 CHECK(night_sweats BETWEEN 0 AND 10),
-                mood_changes INTEGER DEFAULT 0 CHECK(mood_changes BETWEEN 0 AND 10),
-                sleep_issues INTEGER DEFAULT 0 CHECK(sleep_issues BETWEEN 0 AND 10),
-                joint_pain INTEGER DEFAULT 0 CHECK(joint_pain BETWEEN 0 AND 10),
-                brain_fog INTEGER DEFAULT 0 CHECK(brain_fog BETWEEN 0 AND 10),
-                vaginal_dryness INTEGER DEFAULT 0 CHECK(vaginal_dryness BETWEEN 0 AND 10),
-                fatigue INTEGER DEFAULT 0 CHECK(fatigue BETWEEN 0 AND 10),
-                weight_gain REAL DEFAULT 0,
-                anxiety INTEGER DEFAULT 0 CHECK(anxiety BETWEEN 0 AND 10),
-                heart_palpitations INTEGER DEFAULT 0 CHECK(heart_palpitations BETWEEN 0 AND 10),
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-
-        # Menopause treatments table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS menopause_treatments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                treatment_type TEXT NOT NULL,
-                treatment_name TEXT NOT NULL,
-                start_date DATE NOT NULL,
-                end_date DATE,
-                dosage TEXT,
-                effectiveness INTEGER CHECK(effectiveness BETWEEN 0 AND 10),
-                side_effects TEXT,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
+    def init_database(self):
+        """Bring the schema up to date by applying pending migrations"""
+        with self.connection() as conn:
+            applied, version = run_migrations(conn)
 
-        conn.commit()
-        conn.close()
-        print(f"✓ Database initialized at {self.db_path}")
+        for migration in applied:
+            print(f"  ↳ migration {migration['version']} ({migration['name']}) applied in {migration['duration_ms']:.1f} ms")
+        print(f"✓ Database initialized at {self.db_path} (schema v{version})")
 
     def seed_sample_data(self):
         """Add sample data for demo purposes"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Check if data already exists
-        cursor.execute('SELECT COUNT(*) FROM users')
-        if cursor.fetchone()[0] > 0:
-            print("Sample data already exists")
-            conn.close()
-            return
-
-        # Add sample users with menopause data
-        users = [
-            ("9876543210", "Priya", "en", "Bangalore", 0, 46, "early-perimenopause"),
-            ("9876543211", "Ananya", "hi", "Delhi", 0, 50, "late-perimenopause"),
-            ("9876543212", "Lakshmi", "ta", "Chennai", 0, 52, "menopause"),
-            ("9876543213", "Kavya", "kn", "Bangalore", 0, 54, "post-menopause"),
-            ("9876543214", "Meera", "en", "Mumbai", 0, 42, "pre-menopause"),
-        ]
-
-        cursor.executemany(
-            'INSERT INTO users (phone, name, language_pref, city, anonymous, age, menopause_stage) VALUES (?, ?, ?, ?, ?, ?, ?)',
-            users
-        )
+        with self.connection() as conn:
+            cursor = conn.cursor()
+
+            # Check if data already exists
+            cursor.execute('SELECT COUNT(*) FROM users')
+            if cursor.fetchone()[0] > 0:
+                print("Sample data already exists")
+                return
+
+            # Add sample users with menopause data
+            users = [
+                ("9876543210", "Priya", "en", "Bangalore", 0, 46, "early-perimenopause"),
+                ("9876543211", "Ananya", "hi", "Delhi", 0, 50, "late-perimenopause"),
+                ("9876543212", "Lakshmi", "ta", "Chennai", 0, 52, "menopause"),
+                ("9876543213", "Kavya", "kn", "Bangalore", 0, 54, "post-menopause"),
+                ("9876543214", "Meera", "en", "Mumbai", 0, 42, "pre-menopause"),
+            ]
+
+            cursor.executemany(
+                'INSERT INTO users (phone, name, language_pref, city, anonymous, age, menopause_stage) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                users
+            )
 
-        # Add sample posts (menopause-focused)
-        posts = [
-            (1, "I've been experiencing irregular periods and hot flashes. Is this perimenopause?", "en", None, 12),
-            (2, "मुझे रात में पसीना आता है। क्या यह रजोनिवृत्ति का लक्षण है?", "hi", None, 15),
-            (3, "மாதவிடாய் நின்ற பிறகு எலும்பு ஆரோக்கியத்தை எப்படி பராமரிக்கலாம்?", "ta", None, 8),
-            (4, "ಮೆನೋಪಾಸ್ ಸಮಯದಲ್ಲಿ ತೂಕ ಹೆಚ್ಚಾಗುವುದು ಹೇಗೆ ನಿಯಂತ್ರಿಸುವುದು?", "kn", None, 10),
-            (5, "Anyone else dealing with brain fog during perimenopause? Tips please!", "en", None, 18),
-            (1, "HRT has been life-changing for me. Happy to answer questions!", "en", None, 22),
-        ]
-
-        cursor.executemany(
-            'INSERT INTO posts (user_id, content, language, anonymous_name, upvotes) VALUES (?, ?, ?, ?, ?)',
-            posts
-        )
+            # Add sample posts (menopause-focused)
+            posts = [
+                (1, "I've been experiencing irregular periods and hot flashes. Is this perimenopause?", "en", None, 12),
+                (2, "मुझे रात में पसीना आता है। क्या यह रजोनिवृत्ति का लक्षण है?", "hi", None, 15),
+                (3, "மாதவிடாய் நின்ற பிறகு எலும்பு ஆரோக்கியத்தை எப்படி பராமரிக்கலாம்?", "ta", None, 8),
+                (4, "ಮೆನೋಪಾಸ್ ಸಮಯದಲ್ಲಿ ತೂಕ ಹೆಚ್ಚಾಗುವುದು ಹೇಗೆ ನಿಯಂತ್ರಿಸುವುದು?", "kn", None, 10),
+                (5, "Anyone else dealing with brain fog during perimenopause? Tips please!", "en", None, 18),
+                (1, "HRT has been life-changing for me. Happy to answer questions!", "en", None, 22),
+            ]
+
+            cursor.executemany(
+                'INSERT INTO posts (user_id, content, language, anonymous_name, upvotes) VALUES (?, ?, ?, ?, ?)',
+                posts
+            )
 
-        # Add sample comments
-        comments = [
-            (1, 2, "Yes, these are classic perimenopause symptoms. Consult a gynecologist!", "en"),
-            (2, 3, "मुझे भी यही लक्षण थे। योग और ठंडे पानी से स्नान मदद करता है।", "hi"),
-            (5, 4, "I use a symptom tracking app and it helps me identify triggers", "en"),
-            (6, 3, "What type of HRT are you on? I'm considering it too", "en"),
-        ]
-
-        cursor.executemany(
-            'INSERT INTO comments (post_id, user_id, content, language) VALUES (?, ?, ?, ?)',
-            comments
-        )
+            # Add sample comments
+            comments = [
+                (1, 2, "Yes, these are classic perimenopause symptoms. Consult a gynecologist!", "en"),
+                (2, 3, "मुझे भी यही लक्षण थे। योग और ठंडे पानी से स्नान मदद करता है।", "hi"),
+                (5, 4, "I use a symptom tracking app and it helps me identify triggers", "en"),
+                (6, 3, "What type of HRT are you on? I'm considering it too", "en"),
+            ]
+
+            cursor.executemany(
+                'INSERT INTO comments (post_id, user_id, content, language) VALUES (?, ?, ?, ?)',
+                comments
+            )
+            cursor.execute(
+                'UPDATE posts SET comment_count = (SELECT COUNT(*) FROM comments c WHERE c.post_id = posts.id)'
+            )
 
-        # Add sample meetups (menopause-focused)
-        meetups = [
-            ("Perimenopause Support Group", "Monthly meetup to share experiences and tips", "Bangalore", "2025-12-01", "18:00", 1),
-            ("Menopause Wellness Workshop", "Learn about managing symptoms naturally", "Delhi", "2025-12-05", "16:00", 2),
-            ("Post-Menopause Health Talk", "Bone health and heart health after menopause", "Chennai", "2025-12-10", "17:00", 4),
-        ]
+            # Add sample meetups (menopause-focused)
+            meetups = [
+                ("Perimenopause Support Group", "Monthly meetup to share experiences and tips", "Bangalore", "2025-12-01", "18:00", 1),
+                ("Menopause Wellness Workshop", "Learn about managing symptoms naturally", "Delhi", "2025-12-05", "16:00", 2),
+                ("Post-Menopause Health Talk", "Bone health and heart health after menopause", "Chennai", "2025-12-10", "17:00", 4),
+            ]
 
-        cursor.executemany(
-            'INSERT INTO meetups (title, description, city, date, time, created_by) VALUES (?, ?, ?, ?, ?, ?)',
-            meetups
-        )
+            cursor.executemany(
+                'INSERT INTO meetups (title, description, city, date, time, created_by) VALUES (?, ?, ?, ?, ?, ?)',
+                meetups
+            )
 
-        # Generate synthetic period logs and menopause symptoms for each user profile
-        self._generate_menopause_data(cursor)
+            # Generate synthetic period logs and menopause symptoms for each user profile
+            self._generate_menopause_data(cursor)
 
-        conn.commit()
-        conn.close()
         print("✓ Sample data added successfully")
 
     def _generate_menopause_data(self, cursor):
@@ -0,0 +1,149 @@
+"""
+Response cache for the community feed
+Rendered feed pages are cached per (language, limit, cursor) and dropped as a
+whole whenever a write changes what the feed shows; every page carries an
+ETag so unchanged feeds can be answered with 304 Not Modified
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.lru_cache import LRUCache
+
+
+class FeedCacheBackend(ABC):
+    """Storage interface for rendered feed pages; swap in a shared store if needed"""
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Stored value for key, or None"""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any):
+        """Store a value under key"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every stored value"""
+
+    def get_stats(self) -> Dict:
+        return {}
+
+
+class MemoryFeedCacheBackend(FeedCacheBackend):
+    """In-process LRU storage (the default)"""
+
+    def __init__(self, max_size: int, ttl: Optional[float]):
+        self.cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value)
+
+    def clear(self):
+        self.cache.clear()
+
+    def get_stats(self):
+        return self.cache.get_stats()
+
+
+class FeedCache:
+    """
+    Generation-based feed cache
+
+    Keys include a generation number that invalidate() bumps, so a page
+    rendered before a write can never be stored after it.
+    """
+
+    def __init__(self, backend: Optional[FeedCacheBackend] = None):
+        self.backend = backend or MemoryFeedCacheBackend(
+            max_size=int(os.getenv("SAKHI_FEED_CACHE_SIZE", "500")),
+            ttl=float(os.getenv("SAKHI_FEED_CACHE_TTL", "60"))
+        )
+        self.generation = 0
+        self.invalidations = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Cached page for key in the current generation, or None"""
+        return self.backend.get((self.generation, key))
+
+    @staticmethod
+    def render(payload, headers: Dict[str, str]) -> Dict:
+        """Render payload to a JSON page entry with an ETag, without caching it"""
+        body = json.dumps(jsonable_encoder(payload)).encode("utf-8")
+        return {
+            'body': body,
+            'etag': f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            # Body framing headers are recomputed when the page is served
+            'headers': {
+                name: value for name, value in headers.items()
+                if name.lower() not in ('content-length', 'content-type')
+            }
+        }
+
+    def store(self, key: Hashable, payload, headers: Dict[str, str], generation: int) -> Dict:
+        """
+        Render payload and cache it, unless a write invalidated the feed
+        since `generation` was read
+        """
+        entry = self.render(payload, headers)
+        with self._lock:
+            if generation == self.generation:
+                self.backend.set((generation, key), entry)
+        return entry
+
+    def invalidate(self):
+        """Drop every cached page (call after a write that changes the feed)"""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self.backend.clear()
+
+    def respond(self, entry: Dict, request: Request) -> Response:
+        """Serve a cached page, or 304 when the client already has this version"""
+        headers = {**entry['headers'], 'ETag': entry['etag']}
+        client_tags = _parse_if_none_match(request.headers.get('if-none-match'))
+        if '*' in client_tags or entry['etag'] in client_tags:
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry['body'], media_type="application/json", headers=headers)
+
+    def get_stats(self) -> Dict:
+        return {
+            'generation': self.generation,
+            'invalidations': self.invalidations,
+            'not_modified': self.not_modified,
+            'backend': self.backend.get_stats()
+        }
+
+
+def _parse_if_none_match(header: Optional[str]):
+    """ETags listed in an If-None-Match header (weak validators compare equal)"""
+    if not header:
+        return set()
+    tags = set()
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tags.add(tag)
+    return tags
+
+
+# Global instance
+feed_cache = FeedCache()
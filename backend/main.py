@@ -5,12 +5,19 @@ Main FastAPI application for Sakhi backend
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from database import db
+from feed_cache import feed_cache
+from context_cache import context_cache
 import sys
 import os
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backend.services.translation_service import translation_service
+from backend.services.llm_client import llm_client
+from backend.services.response_cache import response_cache
+from backend.services.conversation_memory import conversation_memory
+
 app = FastAPI(
     title="Sakhi API",
     description="Women's Health Companion API",
@@ -24,6 +31,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],  # Keyset pagination cursor, feed cache validator
 )
 
 @app.on_event("startup")
@@ -31,6 +39,18 @@ async def startup_event():
     """Initialize database on startup"""
     print("Starting Sakhi API...")
     db.seed_sample_data()
+    db.start_checkpoint_task()
+    translation_service.start_flush_task()
+    translation_service.start_maintenance_task()
+    translation_service.start_prewarm_workers()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered counters, checkpoint the WAL and release pooled database connections"""
+    await translation_service.stop_prewarm_workers()
+    translation_service.close()
+    db.stop_checkpoint_task()
+    db.close()
 
 @app.get("/")
 async def root():
@@ -55,6 +75,32 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+@app.get("/health/db")
+async def database_health():
+    """Database connection pool metrics"""
+    return {
+        "pool": db.get_pool_stats(),
+        "leaks": db.pool.find_leaks()
+    }
+
+@app.get("/health/cache")
+async def cache_health():
+    """Feed response cache, chatbot answer and context caches, and translation cache metrics"""
+    return {
+        "feed": feed_cache.get_stats(),
+        "chat": response_cache.get_stats(),
+        "chat_context": context_cache.get_stats(),
+        "translation": translation_service.get_cache_stats()
+    }
+
+@app.get("/health/llm")
+async def llm_health():
+    """LLM client concurrency and timeout metrics, and prompt token usage"""
+    return {
+        **llm_client.get_stats(),
+        "memory": conversation_memory.get_stats()
+    }
+
 # Import and include routers
 from routes import auth, period, community, meetups, chatbot, analytics, menopause
 
@@ -0,0 +1,300 @@
+"""
+Versioned schema migrations for Sakhi App
+Each migration runs once and is recorded in the schema_version table
+"""
+
+import time
+
+
+INITIAL_SCHEMA = [
+    # Users table
+    '''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        phone TEXT UNIQUE,
+        name TEXT,
+        language_pref TEXT DEFAULT 'en',
+        city TEXT,
+        anonymous BOOLEAN DEFAULT 0,
+        age INTEGER,
+        menopause_stage TEXT CHECK(menopause_stage IN ('pre-menopause', 'early-perimenopause', 'late-perimenopause', 'menopause', 'post-menopause')) DEFAULT 'pre-menopause',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+
+    # Period logs table
+    '''
+    CREATE TABLE IF NOT EXISTS period_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE,
+        flow_level INTEGER CHECK(flow_level IN (1, 2, 3)),
+        symptoms TEXT,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Community posts table
+    '''
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        language TEXT DEFAULT 'en',
+        anonymous_name TEXT,
+        upvotes INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Comments table
+    '''
+    CREATE TABLE IF NOT EXISTS comments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        language TEXT DEFAULT 'en',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (post_id) REFERENCES posts(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Meetups table
+    '''
+    CREATE TABLE IF NOT EXISTS meetups (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        description TEXT,
+        city TEXT NOT NULL,
+        date DATE NOT NULL,
+        time TIME NOT NULL,
+        meetup_type TEXT DEFAULT 'In-Person',
+        location TEXT,
+        language TEXT DEFAULT 'English',
+        created_by INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (created_by) REFERENCES users(id)
+    )
+    ''',
+
+    # Meetup participants table
+    '''
+    CREATE TABLE IF NOT EXISTS meetup_participants (
+        meetup_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (meetup_id, user_id),
+        FOREIGN KEY (meetup_id) REFERENCES meetups(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Post upvotes table (to track who upvoted what)
+    '''
+    CREATE TABLE IF NOT EXISTS post_upvotes (
+        post_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (post_id, user_id),
+        FOREIGN KEY (post_id) REFERENCES posts(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Meetup stars table (to track who starred what)
+    '''
+    CREATE TABLE IF NOT EXISTS meetup_stars (
+        meetup_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (meetup_id, user_id),
+        FOREIGN KEY (meetup_id) REFERENCES meetups(id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Chat history table (for chatbot)
+    '''
+    CREATE TABLE IF NOT EXISTS chat_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        question TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        language TEXT DEFAULT 'en',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Menopause symptoms table
+    '''
+    CREATE TABLE IF NOT EXISTS menopause_symptoms (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        log_date DATE NOT NULL,
+        hot_flashes INTEGER DEFAULT 0 CHECK(hot_flashes >= 0),
+        night_sweats INTEGER DEFAULT 0 CHECK(night_sweats BETWEEN 0 AND 10),
+        mood_changes INTEGER DEFAULT 0 CHECK(mood_changes BETWEEN 0 AND 10),
+        sleep_issues INTEGER DEFAULT 0 CHECK(sleep_issues BETWEEN 0 AND 10),
+        joint_pain INTEGER DEFAULT 0 CHECK(joint_pain BETWEEN 0 AND 10),
+        brain_fog INTEGER DEFAULT 0 CHECK(brain_fog BETWEEN 0 AND 10),
+        vaginal_dryness INTEGER DEFAULT 0 CHECK(vaginal_dryness BETWEEN 0 AND 10),
+        fatigue INTEGER DEFAULT 0 CHECK(fatigue BETWEEN 0 AND 10),
+        weight_gain REAL DEFAULT 0,
+        anxiety INTEGER DEFAULT 0 CHECK(anxiety BETWEEN 0 AND 10),
+        heart_palpitations INTEGER DEFAULT 0 CHECK(heart_palpitations BETWEEN 0 AND 10),
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+
+    # Menopause treatments table
+    '''
+    CREATE TABLE IF NOT EXISTS menopause_treatments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        treatment_type TEXT NOT NULL,
+        treatment_name TEXT NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE,
+        dosage TEXT,
+        effectiveness INTEGER CHECK(effectiveness BETWEEN 0 AND 10),
+        side_effects TEXT,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+]
+
+
+# Secondary indexes, one per hot lookup. Composite keys put the equality
+# column first and the ORDER BY column second so the index also yields rows
+# in order (rowid is implicitly appended, which keeps `id` tie-breaks free).
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_period_logs_user_start ON period_logs(user_id, start_date, end_date)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_user ON posts(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_comments_post_created ON comments(post_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_meetups_city_date ON meetups(city, date)",
+    "CREATE INDEX IF NOT EXISTS idx_meetups_date ON meetups(date)",
+    "CREATE INDEX IF NOT EXISTS idx_chat_history_user_created ON chat_history(user_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_menopause_symptoms_user_date ON menopause_symptoms(user_id, log_date)",
+    "CREATE INDEX IF NOT EXISTS idx_menopause_treatments_user_start ON menopause_treatments(user_id, start_date)",
+]
+
+
+def _add_column_if_missing(cursor, table, column, definition):
+    """Add a column unless an older schema already has it"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _add_profile_and_meetup_columns(cursor):
+    """Columns added after the first release of the schema"""
+    _add_column_if_missing(cursor, "users", "age", "INTEGER")
+    _add_column_if_missing(
+        cursor, "users", "menopause_stage",
+        "TEXT CHECK(menopause_stage IN ('pre-menopause', 'early-perimenopause', 'late-perimenopause', 'menopause', 'post-menopause')) DEFAULT 'pre-menopause'"
+    )
+    _add_column_if_missing(cursor, "meetups", "meetup_type", "TEXT DEFAULT 'In-Person'")
+    _add_column_if_missing(cursor, "meetups", "location", "TEXT")
+    _add_column_if_missing(cursor, "meetups", "language", "TEXT DEFAULT 'English'")
+    _add_column_if_missing(cursor, "meetups", "stars", "INTEGER DEFAULT 0")
+
+
+def _add_post_comment_count(cursor):
+    """Denormalized comment counter on posts, backfilled from existing comments"""
+    _add_column_if_missing(cursor, "posts", "comment_count", "INTEGER DEFAULT 0")
+    cursor.execute('''
+        UPDATE posts
+        SET comment_count = (SELECT COUNT(*) FROM comments c WHERE c.post_id = posts.id)
+    ''')
+
+
+# Running summary of each user's older chat turns (see services/conversation_memory.py)
+CHAT_SUMMARIES = [
+    '''
+    CREATE TABLE IF NOT EXISTS chat_summaries (
+        user_id INTEGER PRIMARY KEY,
+        summary TEXT NOT NULL,
+        last_chat_id INTEGER NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+]
+
+
+# Ordered list of (version, name, steps). Steps are either a list of SQL
+# statements or a function taking a cursor. Never edit an applied migration;
+# append a new one instead.
+MIGRATIONS = [
+    (1, "initial schema", INITIAL_SCHEMA),
+    (2, "menopause profile and meetup detail columns", _add_profile_and_meetup_columns),
+    (3, "hot query indexes", INDEXES),
+    (4, "post comment counter", _add_post_comment_count),
+    (5, "chat summaries", CHAT_SUMMARIES),
+]
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version (0 for a new database)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms REAL
+        )
+    ''')
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+
+def run_migrations(conn, migrations=MIGRATIONS):
+    """
+    Apply pending migrations in a single transaction
+
+    Returns (applied, version): a list of {version, name, duration_ms} for
+    the migrations that ran (empty when the schema was already current) and
+    the schema version afterwards. Any failure rolls back every pending
+    migration.
+    """
+    applied = []
+    # Take the write lock before reading the version, so a second worker
+    # starting at the same time waits and then sees the migrations applied
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        version = get_schema_version(conn)
+        pending = [m for m in migrations if m[0] > version]
+
+        cursor = conn.cursor()
+        for migration_version, name, steps in pending:
+            started = time.perf_counter()
+            if callable(steps):
+                steps(cursor)
+            else:
+                for statement in steps:
+                    cursor.execute(statement)
+            duration_ms = (time.perf_counter() - started) * 1000
+
+            cursor.execute(
+                'INSERT INTO schema_version (version, name, duration_ms) VALUES (?, ?, ?)',
+                (migration_version, name, duration_ms)
+            )
+            applied.append({"version": migration_version, "name": name, "duration_ms": round(duration_ms, 2)})
+            version = migration_version
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return applied, version
@@ -54,6 +54,7 @@ class Post(BaseModel):
     language: str
     anonymous_name: Optional[str]
     upvotes: int
+    comment_count: int = 0
     created_at: datetime
     translated: bool = False
 
@@ -105,6 +106,7 @@ class ChatResponse(BaseModel):
     language: str
     translated: bool = False
     ai_powered: bool = False
+    prompt_tokens: Optional[int] = None  # Estimated tokens sent to the LLM (None when it wasn't called)
 
 # Analytics models
 class CycleAnalytics(BaseModel):
@@ -0,0 +1,34 @@
+"""
+Keyset (cursor) pagination helpers for Sakhi App
+A cursor is an opaque token holding the (created_at, id) of the last row served,
+so the next page is an index range seek instead of an OFFSET scan
+"""
+
+import base64
+import json
+from fastapi import HTTPException
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at, row_id) -> str:
+    """Build an opaque cursor pointing just past the given row"""
+    raw = json.dumps([created_at, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    """Return (created_at, id) from a cursor, or raise 400 if it is malformed"""
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response, rows, limit):
+    """Expose the next-page cursor in a response header when the page is full"""
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last['created_at'], last['id'])
@@ -15,6 +15,14 @@ from backend.services.health_analytics import health_analytics
 
 router = APIRouter()
 
+PERIOD_LOG_COUNT_SQL = 'SELECT COUNT(*) as count FROM period_logs WHERE user_id = ?'
+
+LATEST_PERIOD_SQL = '''
+    SELECT start_date, end_date FROM period_logs
+    WHERE user_id = ?
+    ORDER BY start_date DESC LIMIT 1
+'''
+
 @router.get("/period/{user_id}")
 async def get_period_analytics(user_id: int):
     """
@@ -41,27 +49,12 @@ async def get_health_summary(user_id: int):
     try:
         from database import db
 
-        conn = db.get_connection()
-        cursor = conn.cursor()
-
         # Get total cycles tracked
-        cursor.execute(
-            'SELECT COUNT(*) as count FROM period_logs WHERE user_id = ?',
-            (user_id,)
-        )
-        result = cursor.fetchone()
+        result = await db.fetchone(PERIOD_LOG_COUNT_SQL, (user_id,))
         total_cycles = result['count'] if result else 0
 
         # Get most recent log
-        cursor.execute(
-            '''SELECT start_date, end_date FROM period_logs
-               WHERE user_id = ?
-               ORDER BY start_date DESC LIMIT 1''',
-            (user_id,)
-        )
-        recent_log = cursor.fetchone()
-
-        conn.close()
+        recent_log = await db.fetchone(LATEST_PERIOD_SQL, (user_id,))
 
         return {
             "total_cycles_tracked": total_cycles,
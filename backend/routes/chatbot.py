@@ -2,9 +2,13 @@
 Chatbot routes for Sakhi App
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from models import ChatRequest, ChatResponse, MessageResponse
 from database import db
+from pagination import decode_cursor, set_next_cursor
+import json
 import sys
 import os
 
@@ -16,6 +20,14 @@ from backend.services.chatbot_service import chatbot_service
 
 router = APIRouter()
 
+CHAT_HISTORY_SQL = 'SELECT * FROM chat_history WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ?'
+
+CHAT_HISTORY_PAGE_SQL = '''
+    SELECT * FROM chat_history
+    WHERE user_id = ? AND (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC LIMIT ?
+'''
+
 # Pre-defined responses for common questions (for demo)
 FAQ_RESPONSES = {
     "en": {
@@ -72,12 +84,8 @@ async def ask_chatbot(user_id: int, request: ChatRequest):
     """Ask a question to the chatbot using LLM with user context"""
     try:
         # Check if user is anonymous
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT is_anonymous FROM users WHERE id = ?', (user_id,))
-        user_row = cursor.fetchone()
-        is_anonymous = user_row['is_anonymous'] if user_row else True
-        conn.close()
+        user_row = await db.fetchone('SELECT anonymous FROM users WHERE id = ?', (user_id,))
+        is_anonymous = bool(user_row['anonymous']) if user_row else True
 
         # Get AI-powered response with user context
         response_data = await chatbot_service.get_response(
@@ -91,49 +99,88 @@ async def ask_chatbot(user_id: int, request: ChatRequest):
         ai_powered = response_data.get('ai_powered', False)
 
         # Save to chat history
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+        await db.execute(
             '''INSERT INTO chat_history (user_id, question, answer, language)
                VALUES (?, ?, ?, ?)''',
             (user_id, request.question, answer, request.language)
         )
-        conn.commit()
-        conn.close()
 
         return ChatResponse(
             answer=answer,
             language=request.language,
             translated=False,
-            ai_powered=ai_powered
+            ai_powered=ai_powered,
+            prompt_tokens=response_data.get('prompt_tokens')
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/history/{user_id}")
-async def get_chat_history(user_id: int, limit: int = 10):
-    """Get chat history for a user"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        'SELECT * FROM chat_history WHERE user_id = ? ORDER BY created_at DESC LIMIT ?',
-        (user_id, limit)
+@router.post("/ask/stream")
+async def ask_chatbot_stream(user_id: int, request: ChatRequest):
+    """
+    Ask a question and stream the answer as server-sent events
+    Each `token` event carries {"text": ...} as it is generated; a final
+    `done` event carries the full answer once it is saved to chat history
+    """
+    user_row = await db.fetchone('SELECT anonymous FROM users WHERE id = ?', (user_id,))
+    is_anonymous = bool(user_row['anonymous']) if user_row else True
+
+    async def events():
+        async for event in chatbot_service.stream_response(
+            user_id=user_id,
+            question=request.question,
+            language=request.language,
+            is_anonymous=is_anonymous
+        ):
+            if event['type'] == 'token':
+                yield f"event: token\ndata: {json.dumps({'text': event['text']})}\n\n"
+                continue
+
+            # Save to chat history
+            await db.execute(
+                '''INSERT INTO chat_history (user_id, question, answer, language)
+                   VALUES (?, ?, ?, ?)''',
+                (user_id, request.question, event['answer'], request.language)
+            )
+
+            done = {
+                'answer': event['answer'],
+                'language': request.language,
+                'translated': False,
+                'ai_powered': event['ai_powered'],
+                'prompt_tokens': event.get('prompt_tokens')
+            }
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    history = cursor.fetchall()
-    conn.close()
+
+@router.get("/history/{user_id}")
+async def get_chat_history(user_id: int, response: Response, limit: int = 10, cursor: Optional[str] = None):
+    """
+    Get chat history for a user, newest first
+    Pass the X-Next-Cursor response header back as `cursor` to fetch older messages
+    """
+    if cursor:
+        created_at, chat_id = decode_cursor(cursor)
+        history = await db.fetchall(CHAT_HISTORY_PAGE_SQL, (user_id, created_at, chat_id, limit))
+    else:
+        history = await db.fetchall(CHAT_HISTORY_SQL, (user_id, limit))
+    set_next_cursor(response, history, limit)
 
     return [dict(chat) for chat in history]
 
 @router.delete("/history/{user_id}")
 async def clear_chat_history(user_id: int):
     """Clear chat history for a user"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def clear(conn):
+        conn.execute('DELETE FROM chat_history WHERE user_id = ?', (user_id,))
+        conn.execute('DELETE FROM chat_summaries WHERE user_id = ?', (user_id,))
 
-    cursor.execute('DELETE FROM chat_history WHERE user_id = ?', (user_id,))
-    conn.commit()
-    conn.close()
+    await db.run(clear)
 
     return MessageResponse(message="Chat history cleared successfully")
@@ -2,10 +2,13 @@
 Community forum routes for Sakhi App
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import List, Optional
 from models import PostCreate, Post, CommentCreate, Comment, MessageResponse
 from database import db
+from pagination import decode_cursor, set_next_cursor
+from feed_cache import feed_cache
+from context_cache import context_cache
 import sys
 import os
 
@@ -16,50 +19,129 @@ from backend.services.translation_service import translation_service
 
 router = APIRouter()
 
+# Feed and comment pages (keyset pagination on (created_at, id))
+FEED_SQL = '''
+    SELECT p.*, u.name as author_name
+    FROM posts p
+    LEFT JOIN users u ON p.user_id = u.id
+    ORDER BY p.created_at DESC, p.id DESC LIMIT ?
+'''
+
+FEED_PAGE_SQL = '''
+    SELECT p.*, u.name as author_name
+    FROM posts p
+    LEFT JOIN users u ON p.user_id = u.id
+    WHERE (p.created_at, p.id) < (?, ?)
+    ORDER BY p.created_at DESC, p.id DESC LIMIT ?
+'''
+
+ALL_COMMENTS_SQL = '''
+    SELECT c.*, u.name as author_name
+    FROM comments c
+    LEFT JOIN users u ON c.user_id = u.id
+    WHERE c.post_id = ?
+    ORDER BY c.created_at ASC, c.id ASC
+'''
+
+COMMENTS_SQL = ALL_COMMENTS_SQL + 'LIMIT ?'
+
+COMMENTS_PAGE_SQL = '''
+    SELECT c.*, u.name as author_name
+    FROM comments c
+    LEFT JOIN users u ON c.user_id = u.id
+    WHERE c.post_id = ? AND (c.created_at, c.id) > (?, ?)
+    ORDER BY c.created_at ASC, c.id ASC LIMIT ?
+'''
+
+async def _translate_content(items, user_lang):
+    """
+    Translate the 'content' of every item whose language differs from
+    user_lang, in one batched round through the translation cache
+
+    Returns True if any item was left with a provisional text (fallback
+    provider output or the untranslated original), which must not be cached
+    """
+    to_translate = [
+        item for item in items
+        if translation_service.should_translate(user_lang, item['language'])
+    ]
+    if not to_translate:
+        return False
+
+    provisional = set()
+    try:
+        translations = await translation_service.translate_many([
+            (item['content'], item['language'], user_lang)
+            for item in to_translate
+        ], provisional)
+        for item in to_translate:
+            item['content'] = translations[(item['content'], item['language'], user_lang)]
+            item['translated'] = True
+    except Exception as e:
+        print(f"Translation error: {e}")
+        return True
+    return bool(provisional)
+
 @router.post("/posts", response_model=MessageResponse)
 async def create_post(user_id: int, post: PostCreate):
     """Create a new community post"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
     try:
         # Generate anonymous name if anonymous posting
         anonymous_name = None
         if post.anonymous:
             anonymous_name = f"User{user_id:04d}"
 
-        cursor.execute(
+        cursor = await db.execute(
             '''INSERT INTO posts (user_id, content, language, anonymous_name, upvotes)
                VALUES (?, ?, ?, ?, 0)''',
             (user_id, post.content, post.language, anonymous_name)
         )
-        conn.commit()
         post_id = cursor.lastrowid
-        conn.close()
+        feed_cache.invalidate()
+        # The chatbot context mentions how many posts the user has made
+        context_cache.invalidate(user_id)
+
+        # Translate for other-language readers before they ask
+        translation_service.enqueue_prewarm(post.content, post.language)
 
         return MessageResponse(message=f"Post created with ID: {post_id}")
 
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/posts")
-async def get_posts(user_lang: str = 'en', limit: int = 20):
-    """Get all community posts with translation if needed"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        '''SELECT p.*, u.name as author_name
-           FROM posts p
-           LEFT JOIN users u ON p.user_id = u.id
-           ORDER BY p.created_at DESC LIMIT ?''',
-        (limit,)
-    )
-    posts = cursor.fetchall()
-    conn.close()
-
-    # Translate posts if user's language differs
+async def get_posts(request: Request, user_lang: str = 'en', limit: int = 20, cursor: Optional[str] = None):
+    """
+    Get community posts, newest first, with translation if needed
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page
+    Pages are cached until the next write; send If-None-Match with the ETag to get a 304
+    """
+    cache_key = (user_lang, limit, cursor)
+    cached = feed_cache.get(cache_key)
+    if cached is None:
+        generation = feed_cache.generation
+        response = Response()
+        posts, provisional = await _render_posts(response, user_lang, limit, cursor)
+        if provisional:
+            # Fallback translations are served but not cached, like in the translation cache
+            cached = feed_cache.render(posts, response.headers)
+        else:
+            cached = feed_cache.store(cache_key, posts, response.headers, generation)
+
+    return feed_cache.respond(cached, request)
+
+async def _render_posts(response: Response, user_lang: str, limit: int, cursor: Optional[str]):
+    """
+    Query and translate one feed page, setting the next-page cursor on response
+    Returns (posts, whether any translation is provisional)
+    """
+    if cursor:
+        created_at, post_id = decode_cursor(cursor)
+        posts = await db.fetchall(FEED_PAGE_SQL, (created_at, post_id, limit))
+    else:
+        posts = await db.fetchall(FEED_SQL, (limit,))
+    set_next_cursor(response, posts, limit)
+
     translated_posts = []
     for post in posts:
         post_dict = dict(post)
@@ -71,31 +153,17 @@ async def get_posts(user_lang: str = 'en', limit: int = 20):
         else:
             post_dict['display_name'] = post_dict.get('author_name', 'Anonymous')
 
-        # Only translate if languages differ
-        if translation_service.should_translate(user_lang, post_dict['language']):
-            try:
-                post_dict['content'] = await translation_service.translate_dynamic_content(
-                    post_dict['content'],
-                    post_dict['language'],
-                    user_lang
-                )
-                post_dict['translated'] = True
-            except Exception as e:
-                print(f"Translation error: {e}")
-
         translated_posts.append(post_dict)
 
-    return translated_posts
+    # Translate every post whose language differs in one concurrent batch
+    provisional = await _translate_content(translated_posts, user_lang)
+
+    return translated_posts, provisional
 
 @router.get("/posts/{post_id}")
 async def get_post(post_id: int, user_lang: str = 'en'):
     """Get a specific post by ID"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('SELECT * FROM posts WHERE id = ?', (post_id,))
-    post = cursor.fetchone()
-    conn.close()
+    post = await db.fetchone('SELECT * FROM posts WHERE id = ?', (post_id,))
 
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -120,106 +188,108 @@ async def get_post(post_id: int, user_lang: str = 'en'):
 @router.post("/posts/{post_id}/upvote")
 async def upvote_post(post_id: int, user_id: int):
     """Upvote a post"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def upvote(conn):
+        cursor = conn.cursor()
 
-    try:
-        # Check if user already upvoted
+        # Add upvote; the (post_id, user_id) primary key rejects a second one
         cursor.execute(
-            'SELECT * FROM post_upvotes WHERE post_id = ? AND user_id = ?',
+            'INSERT OR IGNORE INTO post_upvotes (post_id, user_id) VALUES (?, ?)',
             (post_id, user_id)
         )
-        if cursor.fetchone():
-            conn.close()
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=400, detail="Already upvoted")
 
-        # Add upvote
-        cursor.execute(
-            'INSERT INTO post_upvotes (post_id, user_id) VALUES (?, ?)',
-            (post_id, user_id)
-        )
-
         # Increment upvote count
         cursor.execute(
             'UPDATE posts SET upvotes = upvotes + 1 WHERE id = ?',
             (post_id,)
         )
+        if cursor.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Post not found")
 
-        conn.commit()
-        conn.close()
+    try:
+        # One IMMEDIATE transaction: the vote and the counter change together
+        await db.run_write(upvote)
+        feed_cache.invalidate()
 
         return MessageResponse(message="Post upvoted successfully")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/posts/{post_id}/comments", response_model=MessageResponse)
 async def create_comment(post_id: int, user_id: int, comment: CommentCreate):
     """Add a comment to a post"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def add_comment(conn):
+        cursor = conn.cursor()
+
+        # Increment comment count (and make sure the post exists)
+        cursor.execute(
+            'UPDATE posts SET comment_count = comment_count + 1 WHERE id = ?',
+            (post_id,)
+        )
+        if cursor.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Post not found")
 
-    try:
         cursor.execute(
             '''INSERT INTO comments (post_id, user_id, content, language)
                VALUES (?, ?, ?, ?)''',
             (post_id, user_id, comment.content, comment.language)
         )
-        conn.commit()
-        comment_id = cursor.lastrowid
-        conn.close()
+        return cursor.lastrowid
+
+    try:
+        # One IMMEDIATE transaction: the comment and the counter change together
+        comment_id = await db.run_write(add_comment)
+        feed_cache.invalidate()
+
+        # Translate for other-language readers before they ask
+        translation_service.enqueue_prewarm(comment.content, comment.language)
 
         return MessageResponse(message=f"Comment added with ID: {comment_id}")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/posts/{post_id}/comments")
-async def get_comments(post_id: int, user_lang: str = 'en'):
-    """Get all comments for a post"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        '''SELECT c.*, u.name as author_name
-           FROM comments c
-           LEFT JOIN users u ON c.user_id = u.id
-           WHERE c.post_id = ?
-           ORDER BY c.created_at ASC''',
-        (post_id,)
-    )
-    comments = cursor.fetchall()
-    conn.close()
-
-    # Translate comments if needed
+async def get_comments(post_id: int, response: Response, user_lang: str = 'en', limit: Optional[int] = None, cursor: Optional[str] = None):
+    """
+    Get comments for a post, oldest first
+    Without limit or cursor the whole thread is returned. When paging, pass
+    the X-Next-Cursor response header back as `cursor` to fetch the next page
+    """
+    if cursor:
+        limit = limit or 50
+        created_at, comment_id = decode_cursor(cursor)
+        comments = await db.fetchall(COMMENTS_PAGE_SQL, (post_id, created_at, comment_id, limit))
+    elif limit:
+        comments = await db.fetchall(COMMENTS_SQL, (post_id, limit))
+    else:
+        comments = await db.fetchall(ALL_COMMENTS_SQL, (post_id,))
+    if limit:
+        set_next_cursor(response, comments, limit)
+
     translated_comments = []
     for comment in comments:
         comment_dict = dict(comment)
-
-        if translation_service.should_translate(user_lang, comment_dict['language']):
-            try:
-                comment_dict['content'] = await translation_service.translate_dynamic_content(
-                    comment_dict['content'],
-                    comment_dict['language'],
-                    user_lang
-                )
-            except Exception as e:
-                print(f"Translation error: {e}")
-
+        comment_dict['translated'] = False
         translated_comments.append(comment_dict)
 
+    # Translate the whole page of comments in one batch
+    await _translate_content(translated_comments, user_lang)
+
     return translated_comments
 
 @router.delete("/posts/{post_id}")
 async def delete_post(post_id: int, user_id: int):
     """Delete a post"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('DELETE FROM posts WHERE id = ? AND user_id = ?', (post_id, user_id))
-    conn.commit()
-    conn.close()
+    cursor = await db.execute('DELETE FROM posts WHERE id = ? AND user_id = ?', (post_id, user_id))
+    if cursor.rowcount:
+        feed_cache.invalidate()
+        context_cache.invalidate(user_id)
 
     return MessageResponse(message="Post deleted successfully")
@@ -6,187 +6,184 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 from models import MeetupCreate, Meetup, MessageResponse
 from database import db
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.translation_service import translation_service
 
 router = APIRouter()
 
+# Meetups store display names ("English, Hindi"); map them to translation codes
+MEETUP_LANGUAGE_CODES = {
+    'english': 'en',
+    'hindi': 'hi',
+    'tamil': 'ta',
+    'kannada': 'kn'
+}
+
 @router.post("/create", response_model=MessageResponse)
 async def create_meetup(user_id: int, meetup: MeetupCreate):
     """Create a new meetup"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
     try:
-        cursor.execute(
+        cursor = await db.execute(
             '''INSERT INTO meetups (title, description, city, date, time, meetup_type, location, language, created_by)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
             (meetup.title, meetup.description, meetup.city, meetup.date, meetup.time,
              meetup.meetup_type, meetup.location, meetup.language, user_id)
         )
-        conn.commit()
         meetup_id = cursor.lastrowid
-        conn.close()
 
         return MessageResponse(message=f"Meetup created with ID: {meetup_id}")
 
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/list")
-async def get_meetups(city: str = None, user_id: int = None):
-    """Get all meetups, optionally filtered by city"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+# Meetup rows plus participant count and the viewer's joined/starred flags,
+# resolved in one statement; each subquery is a primary-key probe
+MEETUP_SELECT = '''
+    SELECT m.*,
+           (SELECT COUNT(*) FROM meetup_participants mp
+             WHERE mp.meetup_id = m.id) AS participants_count,
+           EXISTS(SELECT 1 FROM meetup_participants mp
+                   WHERE mp.meetup_id = m.id AND mp.user_id = :user_id) AS user_joined,
+           EXISTS(SELECT 1 FROM meetup_stars ms
+                   WHERE ms.meetup_id = m.id AND ms.user_id = :user_id) AS user_starred
+    FROM meetups m
+'''
+
+MEETUPS_BY_CITY_SQL = MEETUP_SELECT + 'WHERE m.city = :city ORDER BY m.date ASC'
+ALL_MEETUPS_SQL = MEETUP_SELECT + 'ORDER BY m.date ASC'
+MEETUP_BY_ID_SQL = MEETUP_SELECT + 'WHERE m.id = :meetup_id'
+
+def _meetup_dict(row):
+    """Convert a MEETUP_SELECT row, turning the EXISTS flags into booleans"""
+    meetup_dict = dict(row)
+    meetup_dict['user_joined'] = bool(meetup_dict['user_joined'])
+    meetup_dict['user_starred'] = bool(meetup_dict['user_starred'])
+    meetup_dict['translated'] = False
+    return meetup_dict
 
+def _meetup_languages(language):
+    """Language codes of a meetup's comma-separated language list, in listed order"""
+    names = [name.strip().lower() for name in (language or '').split(',')]
+    return [MEETUP_LANGUAGE_CODES[name] for name in names if name in MEETUP_LANGUAGE_CODES]
+
+async def _translate_meetups(meetup_dicts, user_lang):
+    """
+    Translate title and description of meetups not held in user_lang,
+    in one batched round through the translation cache
+    Text is assumed to be written in the first listed language (English if none)
+    The untranslated text stays under original_title/original_description so
+    the creator's edit form never sends a translation back
+    """
+    to_translate = []
+    for meetup_dict in meetup_dicts:
+        codes = _meetup_languages(meetup_dict.get('language'))
+        if user_lang in codes:
+            continue
+        source_lang = codes[0] if codes else 'en'
+        if translation_service.should_translate(user_lang, source_lang):
+            to_translate.append((meetup_dict, source_lang))
+
+    if not to_translate:
+        return
+
+    try:
+        translations = await translation_service.translate_many([
+            (meetup_dict[field], source_lang, user_lang)
+            for meetup_dict, source_lang in to_translate
+            for field in ('title', 'description')
+            if meetup_dict[field]
+        ])
+        for meetup_dict, source_lang in to_translate:
+            for field in ('title', 'description'):
+                meetup_dict[f'original_{field}'] = meetup_dict[field]
+                if meetup_dict[field]:
+                    meetup_dict[field] = translations[(meetup_dict[field], source_lang, user_lang)]
+            meetup_dict['translated'] = True
+    except Exception as e:
+        print(f"Translation error: {e}")
+
+@router.get("/list")
+async def get_meetups(city: str = None, user_id: int = None, user_lang: str = 'en'):
+    """Get all meetups, optionally filtered by city, with translation if needed"""
     if city:
-        cursor.execute('SELECT * FROM meetups WHERE city = ? ORDER BY date ASC', (city,))
+        meetups = await db.fetchall(MEETUPS_BY_CITY_SQL, {'user_id': user_id, 'city': city})
     else:
-        cursor.execute('SELECT * FROM meetups ORDER BY date ASC')
+        meetups = await db.fetchall(ALL_MEETUPS_SQL, {'user_id': user_id})
 
-    meetups = cursor.fetchall()
+    meetup_dicts = [_meetup_dict(meetup) for meetup in meetups]
+    await _translate_meetups(meetup_dicts, user_lang)
 
-    # Get participant counts and check if user joined
-    result = []
-    for meetup in meetups:
-        meetup_dict = dict(meetup)
-
-        # Get participant count
-        cursor.execute(
-            'SELECT COUNT(*) as count FROM meetup_participants WHERE meetup_id = ?',
-            (meetup_dict['id'],)
-        )
-        count = cursor.fetchone()['count']
-        meetup_dict['participants_count'] = count
-
-        # Check if user joined
-        meetup_dict['user_joined'] = False
-        if user_id:
-            cursor.execute(
-                'SELECT * FROM meetup_participants WHERE meetup_id = ? AND user_id = ?',
-                (meetup_dict['id'], user_id)
-            )
-            if cursor.fetchone():
-                meetup_dict['user_joined'] = True
-
-        # Check if user starred
-        meetup_dict['user_starred'] = False
-        if user_id:
-            cursor.execute(
-                'SELECT * FROM meetup_stars WHERE meetup_id = ? AND user_id = ?',
-                (meetup_dict['id'], user_id)
-            )
-            if cursor.fetchone():
-                meetup_dict['user_starred'] = True
-
-        result.append(meetup_dict)
-
-    conn.close()
-    return result
+    return meetup_dicts
 
 @router.get("/{meetup_id}")
-async def get_meetup(meetup_id: int, user_id: int = None):
-    """Get a specific meetup by ID"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('SELECT * FROM meetups WHERE id = ?', (meetup_id,))
-    meetup = cursor.fetchone()
+async def get_meetup(meetup_id: int, user_id: int = None, user_lang: str = 'en'):
+    """Get a specific meetup by ID, with translation if needed"""
+    meetup = await db.fetchone(MEETUP_BY_ID_SQL, {'user_id': user_id, 'meetup_id': meetup_id})
 
     if not meetup:
-        conn.close()
         raise HTTPException(status_code=404, detail="Meetup not found")
 
-    meetup_dict = dict(meetup)
-
-    # Get participant count
-    cursor.execute(
-        'SELECT COUNT(*) as count FROM meetup_participants WHERE meetup_id = ?',
-        (meetup_id,)
-    )
-    count = cursor.fetchone()['count']
-    meetup_dict['participants_count'] = count
-
-    # Check if user joined
-    meetup_dict['user_joined'] = False
-    if user_id:
-        cursor.execute(
-            'SELECT * FROM meetup_participants WHERE meetup_id = ? AND user_id = ?',
-            (meetup_id, user_id)
-        )
-        if cursor.fetchone():
-            meetup_dict['user_joined'] = True
-
-    # Check if user starred
-    meetup_dict['user_starred'] = False
-    if user_id:
-        cursor.execute(
-            'SELECT * FROM meetup_stars WHERE meetup_id = ? AND user_id = ?',
-            (meetup_id, user_id)
-        )
-        if cursor.fetchone():
-            meetup_dict['user_starred'] = True
+    meetup_dict = _meetup_dict(meetup)
+    await _translate_meetups([meetup_dict], user_lang)
 
-    conn.close()
     return meetup_dict
 
 @router.post("/{meetup_id}/join")
 async def join_meetup(meetup_id: int, user_id: int):
     """Join a meetup"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def join(conn):
+        cursor = conn.cursor()
 
-    try:
         # Check if already joined
         cursor.execute(
             'SELECT * FROM meetup_participants WHERE meetup_id = ? AND user_id = ?',
             (meetup_id, user_id)
         )
         if cursor.fetchone():
-            conn.close()
             raise HTTPException(status_code=400, detail="Already joined this meetup")
 
         cursor.execute(
             'INSERT INTO meetup_participants (meetup_id, user_id) VALUES (?, ?)',
             (meetup_id, user_id)
         )
-        conn.commit()
-        conn.close()
+
+    try:
+        await db.run(join)
 
         return MessageResponse(message="Successfully joined meetup")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{meetup_id}/leave")
 async def leave_meetup(meetup_id: int, user_id: int):
     """Leave a meetup"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
+    await db.execute(
         'DELETE FROM meetup_participants WHERE meetup_id = ? AND user_id = ?',
         (meetup_id, user_id)
     )
-    conn.commit()
-    conn.close()
 
     return MessageResponse(message="Successfully left meetup")
 
 @router.post("/{meetup_id}/star")
 async def star_meetup(meetup_id: int, user_id: int):
     """Star a meetup"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def star(conn):
+        cursor = conn.cursor()
 
-    try:
         # Check if already starred
         cursor.execute(
             'SELECT * FROM meetup_stars WHERE meetup_id = ? AND user_id = ?',
             (meetup_id, user_id)
         )
         if cursor.fetchone():
-            conn.close()
             raise HTTPException(status_code=400, detail="Already starred this meetup")
 
         # Add star
@@ -201,33 +198,35 @@ async def star_meetup(meetup_id: int, user_id: int):
             (meetup_id,)
         )
 
-        conn.commit()
-        conn.close()
+    try:
+        await db.run(star)
 
         return MessageResponse(message="Meetup starred successfully")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _check_creator(cursor, meetup_id, user_id, action):
+    """Raise 404/403 unless the meetup exists and was created by user_id"""
+    cursor.execute('SELECT created_by FROM meetups WHERE id = ?', (meetup_id,))
+    result = cursor.fetchone()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Meetup not found")
+
+    if result['created_by'] != user_id:
+        raise HTTPException(status_code=403, detail=f"Only creator can {action} this meetup")
+
 @router.put("/{meetup_id}", response_model=MessageResponse)
 async def update_meetup(meetup_id: int, user_id: int, meetup: MeetupCreate):
     """Update a meetup (only creator can update)"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def update(conn):
+        cursor = conn.cursor()
 
-    try:
         # Verify user is the creator
-        cursor.execute('SELECT created_by FROM meetups WHERE id = ?', (meetup_id,))
-        result = cursor.fetchone()
-
-        if not result:
-            conn.close()
-            raise HTTPException(status_code=404, detail="Meetup not found")
-
-        if result['created_by'] != user_id:
-            conn.close()
-            raise HTTPException(status_code=403, detail="Only creator can update this meetup")
+        _check_creator(cursor, meetup_id, user_id, "update")
 
         # Update the meetup
         cursor.execute(
@@ -238,41 +237,35 @@ async def update_meetup(meetup_id: int, user_id: int, meetup: MeetupCreate):
             (meetup.title, meetup.description, meetup.city, meetup.date, meetup.time,
              meetup.meetup_type, meetup.location, meetup.language, meetup_id, user_id)
         )
-        conn.commit()
-        conn.close()
+
+    try:
+        await db.run(update)
 
         return MessageResponse(message="Meetup updated successfully")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{meetup_id}")
 async def delete_meetup(meetup_id: int, user_id: int):
     """Delete a meetup (only creator can delete)"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def delete(conn):
+        cursor = conn.cursor()
 
-    try:
         # Verify user is the creator before deleting
-        cursor.execute('SELECT created_by FROM meetups WHERE id = ?', (meetup_id,))
-        result = cursor.fetchone()
-
-        if not result:
-            conn.close()
-            raise HTTPException(status_code=404, detail="Meetup not found")
-
-        if result['created_by'] != user_id:
-            conn.close()
-            raise HTTPException(status_code=403, detail="Only creator can delete this meetup")
+        _check_creator(cursor, meetup_id, user_id, "delete")
 
         # Delete the meetup
         cursor.execute('DELETE FROM meetups WHERE id = ? AND created_by = ?', (meetup_id, user_id))
-        conn.commit()
-        conn.close()
+
+    try:
+        await db.run(delete)
 
         return MessageResponse(message="Meetup deleted successfully")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
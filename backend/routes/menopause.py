@@ -10,19 +10,38 @@ from models import (
     MenopauseAnalytics, MessageResponse
 )
 from database import db
+from context_cache import context_cache
 from datetime import datetime, timedelta
 import statistics
 
 router = APIRouter()
 
+SYMPTOM_LOGS_SQL = '''
+    SELECT * FROM menopause_symptoms
+    WHERE user_id = ? ORDER BY log_date DESC LIMIT ?
+'''
+
+TREATMENTS_SQL = '''
+    SELECT * FROM menopause_treatments
+    WHERE user_id = ? ORDER BY start_date DESC
+'''
+
+ACTIVE_TREATMENTS_SQL = '''
+    SELECT * FROM menopause_treatments
+    WHERE user_id = ? AND (end_date IS NULL OR end_date >= date('now'))
+    ORDER BY start_date DESC
+'''
+
+PERIOD_STARTS_SQL = '''
+    SELECT start_date FROM period_logs
+    WHERE user_id = ? ORDER BY start_date DESC LIMIT 20
+'''
+
 @router.post("/symptom/log", response_model=MessageResponse)
 async def log_menopause_symptom(user_id: int, symptom: MenopauseSymptomCreate):
     """Log menopause symptoms for a specific date"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
     try:
-        cursor.execute(
+        cursor = await db.execute(
             '''INSERT INTO menopause_symptoms
             (user_id, log_date, hot_flashes, night_sweats, mood_changes, sleep_issues,
              joint_pain, brain_fog, vaginal_dryness, fatigue, weight_gain, anxiety, heart_palpitations, notes)
@@ -32,96 +51,78 @@ async def log_menopause_symptom(user_id: int, symptom: MenopauseSymptomCreate):
              symptom.brain_fog, symptom.vaginal_dryness, symptom.fatigue,
              symptom.weight_gain, symptom.anxiety, symptom.heart_palpitations, symptom.notes)
         )
-        conn.commit()
         log_id = cursor.lastrowid
-        conn.close()
+        context_cache.invalidate(user_id)
 
         return MessageResponse(message=f"Menopause symptom logged with ID: {log_id}")
 
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/symptom/logs/{user_id}")
 async def get_symptom_logs(user_id: int, limit: int = 30):
     """Get menopause symptom logs for a user"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        '''SELECT * FROM menopause_symptoms
-           WHERE user_id = ? ORDER BY log_date DESC LIMIT ?''',
-        (user_id, limit)
-    )
-    logs = cursor.fetchall()
-    conn.close()
+    logs = await db.fetchall(SYMPTOM_LOGS_SQL, (user_id, limit))
 
     return [dict(log) for log in logs]
 
 @router.post("/treatment/add", response_model=MessageResponse)
 async def add_treatment(user_id: int, treatment: MenopauseTreatmentCreate):
     """Add a menopause treatment"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
     try:
-        cursor.execute(
+        cursor = await db.execute(
             '''INSERT INTO menopause_treatments
             (user_id, treatment_type, treatment_name, start_date, end_date, dosage, effectiveness, side_effects, notes)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
             (user_id, treatment.treatment_type, treatment.treatment_name, treatment.start_date,
              treatment.end_date, treatment.dosage, treatment.effectiveness, treatment.side_effects, treatment.notes)
         )
-        conn.commit()
         treatment_id = cursor.lastrowid
-        conn.close()
+        context_cache.invalidate(user_id)
 
         return MessageResponse(message=f"Treatment added with ID: {treatment_id}")
 
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/treatment/list/{user_id}")
 async def get_treatments(user_id: int):
     """Get all treatments for a user"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        '''SELECT * FROM menopause_treatments
-           WHERE user_id = ? ORDER BY start_date DESC''',
-        (user_id,)
-    )
-    treatments = cursor.fetchall()
-    conn.close()
+    treatments = await db.fetchall(TREATMENTS_SQL, (user_id,))
 
     return [dict(treatment) for treatment in treatments]
 
 @router.get("/analytics/{user_id}", response_model=MenopauseAnalytics)
 async def get_menopause_analytics(user_id: int):
     """Get comprehensive menopause analytics for a user"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
+    def fetch_menopause_data(conn):
+        cursor = conn.cursor()
 
-    # Get user info
-    cursor.execute('SELECT age, menopause_stage FROM users WHERE id = ?', (user_id,))
-    user = cursor.fetchone()
-    if not user:
-        conn.close()
-        raise HTTPException(status_code=404, detail="User not found")
+        # Get user info
+        cursor.execute('SELECT age, menopause_stage FROM users WHERE id = ?', (user_id,))
+        user = cursor.fetchone()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        # Get period logs
+        cursor.execute(PERIOD_STARTS_SQL, (user_id,))
+        period_logs = cursor.fetchall()
+
+        # Get symptom logs
+        cursor.execute(SYMPTOM_LOGS_SQL, (user_id, 90))
+        symptom_logs = cursor.fetchall()
+
+        # Get treatment data
+        cursor.execute(ACTIVE_TREATMENTS_SQL, (user_id,))
+        active_treatments_data = cursor.fetchall()
+
+        return user, period_logs, symptom_logs, active_treatments_data
+
+    user, period_logs, symptom_logs, active_treatments_data = await db.run(fetch_menopause_data)
 
     age = user['age']
     menopause_stage = user['menopause_stage']
 
-    # Get period logs
-    cursor.execute(
-        '''SELECT start_date FROM period_logs
-           WHERE user_id = ? ORDER BY start_date DESC LIMIT 20''',
-        (user_id,)
-    )
-    period_logs = cursor.fetchall()
-
     # Calculate cycle analytics
     days_since_last_period = None
     cycle_variability = 0.0
@@ -146,13 +147,6 @@ async def get_menopause_analytics(user_id: int):
             cycle_variability = statistics.stdev(cycle_lengths) if len(cycle_lengths) > 1 else 0.0
             longest_gap = max(cycle_lengths)
 
-    # Get symptom logs
-    cursor.execute(
-        '''SELECT * FROM menopause_symptoms
-           WHERE user_id = ? ORDER BY log_date DESC LIMIT 90''',
-        (user_id,)
-    )
-    symptom_logs = cursor.fetchall()
     total_symptom_logs = len(symptom_logs)
 
     # Calculate symptom analytics
@@ -231,16 +225,6 @@ async def get_menopause_analytics(user_id: int):
         mood_values = [log['mood_changes'] for log in symptom_logs if log['mood_changes'] > 0]
         avg_mood_score = 10 - (sum(mood_values) / len(mood_values)) if mood_values else 10.0
 
-    # Get treatment data
-    cursor.execute(
-        '''SELECT * FROM menopause_treatments
-           WHERE user_id = ? AND (end_date IS NULL OR end_date >= date('now'))
-           ORDER BY start_date DESC''',
-        (user_id,)
-    )
-    active_treatments_data = cursor.fetchall()
-    conn.close()
-
     active_treatments = [
         {
             'type': t['treatment_type'],
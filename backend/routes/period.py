@@ -6,60 +6,46 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 from models import PeriodLogCreate, PeriodLog, MessageResponse, CycleAnalytics
 from database import db
+from context_cache import context_cache
 from datetime import datetime, timedelta
 
 router = APIRouter()
 
+PERIOD_LOGS_SQL = 'SELECT * FROM period_logs WHERE user_id = ? ORDER BY start_date DESC'
+
+RECENT_PERIOD_DATES_SQL = '''
+    SELECT start_date, end_date FROM period_logs
+    WHERE user_id = ? ORDER BY start_date DESC LIMIT 10
+'''
+
 @router.post("/log", response_model=MessageResponse)
 async def create_period_log(user_id: int, log: PeriodLogCreate):
     """Create a new period log entry"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
     try:
-        cursor.execute(
+        cursor = await db.execute(
             '''INSERT INTO period_logs (user_id, start_date, end_date, flow_level, symptoms, notes)
                VALUES (?, ?, ?, ?, ?, ?)''',
             (user_id, log.start_date, log.end_date, log.flow_level, log.symptoms, log.notes)
         )
-        conn.commit()
         log_id = cursor.lastrowid
-        conn.close()
+        context_cache.invalidate(user_id)
 
         return MessageResponse(message=f"Period log created with ID: {log_id}")
 
     except Exception as e:
-        conn.close()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/logs/{user_id}")
 async def get_period_logs(user_id: int):
     """Get all period logs for a user"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        'SELECT * FROM period_logs WHERE user_id = ? ORDER BY start_date DESC',
-        (user_id,)
-    )
-    logs = cursor.fetchall()
-    conn.close()
+    logs = await db.fetchall(PERIOD_LOGS_SQL, (user_id,))
 
     return [dict(log) for log in logs]
 
 @router.get("/analytics/{user_id}", response_model=CycleAnalytics)
 async def get_cycle_analytics(user_id: int):
     """Get cycle analytics for a user"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        '''SELECT start_date, end_date FROM period_logs
-           WHERE user_id = ? ORDER BY start_date DESC LIMIT 10''',
-        (user_id,)
-    )
-    logs = cursor.fetchall()
-    conn.close()
+    logs = await db.fetchall(RECENT_PERIOD_DATES_SQL, (user_id,))
 
     if not logs:
         return CycleAnalytics(
@@ -103,11 +89,8 @@ async def get_cycle_analytics(user_id: int):
 @router.delete("/log/{log_id}")
 async def delete_period_log(log_id: int, user_id: int):
     """Delete a period log"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute('DELETE FROM period_logs WHERE id = ? AND user_id = ?', (log_id, user_id))
-    conn.commit()
-    conn.close()
+    cursor = await db.execute('DELETE FROM period_logs WHERE id = ? AND user_id = ?', (log_id, user_id))
+    if cursor.rowcount:
+        context_cache.invalidate(user_id)
 
     return MessageResponse(message="Period log deleted successfully")
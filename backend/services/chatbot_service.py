@@ -3,24 +3,39 @@ Chatbot Service using Claude AI via LiteLLM with User Health Data Access
 Provides personalized health guidance based on user's period tracking data
 """
 
-from litellm import completion
-import os
+import asyncio
 import json
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
 from database import db
+from context_cache import context_cache
+from backend.services.llm_client import llm_client
+from backend.services.response_cache import response_cache, context_fingerprint
+from backend.services.conversation_memory import conversation_memory
+
+CONTEXT_PERIOD_LOGS_SQL = '''
+    SELECT start_date, end_date, flow_level, symptoms, notes
+    FROM period_logs
+    WHERE user_id = ?
+    ORDER BY start_date DESC
+    LIMIT 6
+'''
+
+POST_COUNT_SQL = 'SELECT COUNT(*) as post_count FROM posts WHERE user_id = ?'
+
 
 class ChatbotService:
     """LLM-powered chatbot service using Claude via LiteLLM for women's health queries"""
 
     def __init__(self):
-        # Get API key from environment variable
-        self.api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        if not self.api_key:
+        self.llm = llm_client
+        # Answers are reused for repeated questions asked with the same context
+        self.cache = response_cache
+        # Earlier turns of the conversation, kept under a token budget
+        self.memory = conversation_memory
+        if not self.llm.available:
             print("Warning: ANTHROPIC_API_KEY not set. Chatbot will use FAQ responses.")
 
-        # LiteLLM will use the ANTHROPIC_API_KEY from environment
-
         # System prompt for Sakhi chatbot
         self.system_prompt = """You are Sakhi, a compassionate and knowledgeable women's health companion chatbot. You specialize in:
 - Menstrual health and cycle tracking
@@ -50,10 +65,10 @@ Important guidelines:
         # Get user's health context if not anonymous
         user_context = ""
         if not is_anonymous and user_id:
-            user_context = self._build_user_context(user_id)
+            user_context = await self._build_user_context(user_id)
 
-        # If no API key, fall back to FAQ
-        if not self.api_key:
+        # If no LLM is configured, fall back to FAQ
+        if not self.llm.available:
             return {
                 "answer": self._get_faq_fallback(question, language),
                 "language": language,
@@ -61,32 +76,50 @@ Important guidelines:
                 "has_user_context": False
             }
 
+        memory = await self.memory.load(user_id) if user_id else None
+
+        # Anonymous users and users without logged data share the generic answers
+        # for the first question of a conversation
+        fingerprint = context_fingerprint(user_context, self._history_text(memory))
+        cached = self.cache.get(question, language, fingerprint)
+        if cached is not None:
+            return {
+                "answer": cached,
+                "language": language,
+                "ai_powered": True,
+                "has_user_context": bool(user_context and not is_anonymous),
+                "cached": True
+            }
+
+        messages = self._build_messages(question, user_context, language, is_anonymous, memory)
+        prompt_tokens = self.memory.record(messages, memory)
+
         # Generate AI response using Claude via LiteLLM
         try:
-            # Build the prompt with user context
-            user_message = self._build_prompt(question, user_context, language, is_anonymous)
-
-            # Use LiteLLM's completion function with Claude
-            response = completion(
-                model="claude-3-5-sonnet-20241022",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
+            # Async completion: the event loop keeps serving other requests meanwhile
+            answer = await self.llm.complete(
+                messages=messages,
                 max_tokens=800,
-                temperature=0.7,  # Slightly creative but still reliable
-                api_key=self.api_key
+                temperature=0.7  # Slightly creative but still reliable
             )
-
-            answer = response.choices[0].message.content
+            self.cache.set(question, language, fingerprint, answer)
 
             return {
                 "answer": answer,
                 "language": language,
                 "ai_powered": True,
-                "has_user_context": bool(user_context and not is_anonymous)
+                "has_user_context": bool(user_context and not is_anonymous),
+                "prompt_tokens": prompt_tokens
             }
 
+        except asyncio.TimeoutError:
+            print(f"AI response timed out after {self.llm.timeout}s")
+            return {
+                "answer": self._get_faq_fallback(question, language),
+                "language": language,
+                "ai_powered": False,
+                "has_user_context": False
+            }
         except Exception as e:
             print(f"Error generating AI response: {e}")
             # Fallback to FAQ
@@ -97,23 +130,125 @@ Important guidelines:
                 "has_user_context": False
             }
 
-    def _build_user_context(self, user_id: int) -> str:
-        """Build context from user's health data"""
-        conn = db.get_connection()
-        cursor = conn.cursor()
+    async def stream_response(self, user_id: int, question: str, language: str,
+                              is_anonymous: bool = False) -> AsyncIterator[Dict]:
+        """
+        Stream a chatbot response as events:
+        {"type": "token", "text": ...} for each piece of the answer, then one
+        {"type": "done", "answer": ..., "ai_powered": ..., "has_user_context": ...}
+        If the model is unavailable or fails before answering, the FAQ
+        fallback is sent as a single token
+        """
+        user_context = ""
+        if not is_anonymous and user_id:
+            user_context = await self._build_user_context(user_id)
+
+        memory = None
+        if self.llm.available and user_id:
+            memory = await self.memory.load(user_id)
+
+        fingerprint = context_fingerprint(user_context, self._history_text(memory))
+        cached = self.cache.get(question, language, fingerprint) if self.llm.available else None
+        if cached is not None:
+            yield {"type": "token", "text": cached}
+            yield {
+                "type": "done",
+                "answer": cached,
+                "ai_powered": True,
+                "has_user_context": bool(user_context and not is_anonymous)
+            }
+            return
+
+        parts = []
+        complete = False
+        prompt_tokens = None
+        if self.llm.available:
+            messages = self._build_messages(question, user_context, language, is_anonymous, memory)
+            prompt_tokens = self.memory.record(messages, memory)
+            try:
+                async for text in self.llm.stream(
+                    messages=messages,
+                    max_tokens=800,
+                    temperature=0.7
+                ):
+                    parts.append(text)
+                    yield {"type": "token", "text": text}
+                complete = True
+            except asyncio.TimeoutError:
+                print(f"AI response stream timed out after {self.llm.timeout}s")
+            except Exception as e:
+                print(f"Error streaming AI response: {e}")
+
+        if parts:
+            answer = "".join(parts)
+            if complete:
+                self.cache.set(question, language, fingerprint, answer)
+            yield {
+                "type": "done",
+                "answer": answer,
+                "ai_powered": True,
+                "has_user_context": bool(user_context and not is_anonymous),
+                "prompt_tokens": prompt_tokens
+            }
+            return
+
+        # Fallback to FAQ
+        answer = self._get_faq_fallback(question, language)
+        yield {"type": "token", "text": answer}
+        yield {"type": "done", "answer": answer, "ai_powered": False, "has_user_context": False}
+
+    def _build_messages(self, question: str, user_context: str, language: str, is_anonymous: bool,
+                        memory: Optional[Dict] = None) -> List[Dict]:
+        """
+        System prompt (with the summary of older turns), the recent turns of
+        the conversation, then the user's question with their health context
+        """
+        system_prompt = self.system_prompt
+        if memory and memory['summary']:
+            system_prompt += f"\n\nSummary of the earlier conversation with this user:\n{memory['summary']}"
+
+        messages = [{"role": "system", "content": system_prompt}]
+        for turn in (memory['turns'] if memory else []):
+            messages.append({"role": "user", "content": turn['question']})
+            messages.append({"role": "assistant", "content": turn['answer']})
+        messages.append(
+            {"role": "user", "content": self._build_prompt(question, user_context, language, is_anonymous)}
+        )
+        return messages
 
-        context_parts = []
+    @staticmethod
+    def _history_text(memory: Optional[Dict]) -> str:
+        """The conversation so far as sent to the model ('' for a new conversation)"""
+        if not memory:
+            return ''
+        parts = [memory['summary']] if memory['summary'] else []
+        for turn in memory['turns']:
+            parts.extend((turn['question'], turn['answer']))
+        return "\n".join(parts)
 
-        # Get recent period logs
-        cursor.execute(
-            '''SELECT start_date, end_date, flow_level, symptoms, notes
-               FROM period_logs
-               WHERE user_id = ?
-               ORDER BY start_date DESC
-               LIMIT 6''',
-            (user_id,)
-        )
-        period_logs = cursor.fetchall()
+    async def _build_user_context(self, user_id: int) -> str:
+        """Build context from user's health data (cached until the user's data changes)"""
+        cached = context_cache.get(user_id)
+        if cached is not None:
+            return cached
+        version = context_cache.version(user_id)
+
+        def fetch_context_data(conn):
+            cursor = conn.cursor()
+
+            # Get recent period logs
+            cursor.execute(CONTEXT_PERIOD_LOGS_SQL, (user_id,))
+            period_logs = cursor.fetchall()
+
+            # Get recent community activity (anonymized)
+            cursor.execute(POST_COUNT_SQL, (user_id,))
+            post_count = cursor.fetchone()['post_count']
+
+            return period_logs, post_count
+
+        period_logs, post_count = await db.run(fetch_context_data)
+
+        context_parts = []
 
         if period_logs:
             context_parts.append("User's Recent Period Data:")
@@ -154,20 +289,12 @@ Important guidelines:
                     regularity = "irregular"
                 context_parts.append(f"Cycle Regularity: {regularity}")
 
-        # Get recent community activity (anonymized)
-        cursor.execute(
-            '''SELECT COUNT(*) as post_count FROM posts WHERE user_id = ?''',
-            (user_id,)
-        )
-        post_count = cursor.fetchone()['post_count']
         if post_count > 0:
             context_parts.append(f"\nUser is active in community (made {post_count} posts)")
 
-        conn.close()
-
-        if context_parts:
-            return "\n".join(context_parts)
-        return ""
+        context = "\n".join(context_parts)
+        context_cache.store(user_id, context, version)
+        return context
 
     def _build_prompt(self, question: str, user_context: str, language: str, is_anonymous: bool) -> str:
         """Build the complete prompt for Claude"""
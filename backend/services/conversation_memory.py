@@ -0,0 +1,193 @@
+"""
+Conversation memory for the Sakhi chatbot
+Recent turns from chat_history are sent back to the model under a token
+budget; turns that no longer fit are folded into a running summary (stored
+in chat_summaries) in the background instead of being re-sent every time
+"""
+
+import asyncio
+import math
+import os
+from typing import Dict, List, Optional
+
+from database import db
+from backend.services.llm_client import llm_client
+
+# Summary of the session's older turns, if it was updated within the session
+SESSION_SUMMARY_SQL = '''
+    SELECT summary, last_chat_id FROM chat_summaries
+    WHERE user_id = ? AND updated_at >= datetime('now', ?)
+'''
+
+# Session turns not yet folded into the summary, newest first
+SESSION_TURNS_SQL = '''
+    SELECT id, question, answer FROM chat_history
+    WHERE user_id = ? AND created_at >= datetime('now', ?) AND id > ?
+    ORDER BY created_at DESC, id DESC LIMIT ?
+'''
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+class ConversationMemory:
+    """
+    Token-budgeted view of a user's current conversation
+
+    A conversation session is the user's turns from the last
+    session_hours; older turns and their summary are left out.
+    """
+
+    def __init__(self, llm=None):
+        self.llm = llm or llm_client
+        # Tokens for summary + recent turns sent with each question
+        self.history_budget = int(os.getenv("SAKHI_CHAT_HISTORY_TOKENS", "1200"))
+        # Part of the budget kept for the running summary
+        self.summary_budget = int(os.getenv("SAKHI_CHAT_SUMMARY_TOKENS", "300"))
+        self.session_hours = float(os.getenv("SAKHI_CHAT_SESSION_HOURS", "24"))
+        self.max_turns = 50  # Most turns considered for the window per request
+
+        self._compacting = set()  # user_ids with a summary update in flight
+        self._tasks = set()
+
+        self.stats = {
+            'requests': 0,
+            'prompt_tokens_total': 0,
+            'prompt_tokens_max': 0,
+            'last_prompt_tokens': 0,
+            'history_tokens_total': 0,
+            'summaries_written': 0,
+            'summary_errors': 0
+        }
+
+    async def _fetch(self, user_id: int):
+        """The user's summary (if still in session) and the turns after it, newest first"""
+        session_start = f"-{self.session_hours} hours"
+
+        def fetch(conn):
+            summary_row = conn.execute(SESSION_SUMMARY_SQL, (user_id, session_start)).fetchone()
+            last_chat_id = summary_row['last_chat_id'] if summary_row else 0
+            turns = conn.execute(
+                SESSION_TURNS_SQL, (user_id, session_start, last_chat_id, self.max_turns)
+            ).fetchall()
+            return summary_row, turns
+
+        summary_row, rows = await db.run(fetch)
+        return (summary_row['summary'] if summary_row else ''), rows
+
+    def _window_size(self, summary: str, rows) -> int:
+        """How many of the newest rows fit in the budget left after the summary"""
+        budget = self.history_budget - max(estimate_tokens(summary), self.summary_budget)
+        kept = 0
+        for row in rows:
+            cost = estimate_tokens(row['question']) + estimate_tokens(row['answer'])
+            if cost > budget:
+                break
+            budget -= cost
+            kept += 1
+        return kept
+
+    async def load(self, user_id: int) -> Dict:
+        """
+        Summary and recent turns of the user's current session, oldest first
+        {"summary": str, "turns": [{"question", "answer"}, ...]}
+        Older turns that no longer fit are queued for summarizing
+        """
+        summary, rows = await self._fetch(user_id)
+        kept = self._window_size(summary, rows)
+        if kept < len(rows):
+            self._schedule_compaction(user_id)
+
+        turns = [{'question': row['question'], 'answer': row['answer']} for row in rows[:kept]]
+        turns.reverse()
+        return {'summary': summary, 'turns': turns}
+
+    def record(self, messages: List[Dict], memory: Optional[Dict]) -> int:
+        """Count the estimated prompt tokens of a request; returns the count"""
+        tokens = sum(estimate_tokens(message['content']) for message in messages)
+        history_tokens = 0
+        if memory:
+            history_tokens = estimate_tokens(memory['summary']) + sum(
+                estimate_tokens(turn['question']) + estimate_tokens(turn['answer'])
+                for turn in memory['turns']
+            )
+
+        self.stats['requests'] += 1
+        self.stats['prompt_tokens_total'] += tokens
+        self.stats['prompt_tokens_max'] = max(self.stats['prompt_tokens_max'], tokens)
+        self.stats['last_prompt_tokens'] = tokens
+        self.stats['history_tokens_total'] += history_tokens
+        return tokens
+
+    def _schedule_compaction(self, user_id: int):
+        """Update the user's summary in the background (one update per user at a time)"""
+        if user_id in self._compacting or not self.llm.available:
+            return
+        self._compacting.add(user_id)
+        task = asyncio.create_task(self._compact(user_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _compact(self, user_id: int):
+        """Fold the turns that fall outside the window into the running summary"""
+        try:
+            summary, rows = await self._fetch(user_id)
+            # Everything older than the window load() sends is folded in
+            kept = self._window_size(summary, rows)
+            overflow = list(reversed(rows[kept:]))
+            if not overflow:
+                return
+
+            transcript = "\n".join(
+                f"User: {row['question']}\nSakhi: {row['answer']}" for row in overflow
+            )
+            new_summary = await self.llm.complete(
+                messages=[
+                    {"role": "system", "content": (
+                        "You maintain a short running summary of a conversation between a user and "
+                        "Sakhi, a women's health companion. Keep facts the user shared about "
+                        "themselves, their concerns and any advice already given. Reply with the "
+                        "updated summary only, in the language of the conversation."
+                    )},
+                    {"role": "user", "content": (
+                        f"Current summary:\n{summary or '(none)'}\n\n"
+                        f"Earlier turns to add:\n{transcript}"
+                    )}
+                ],
+                max_tokens=self.summary_budget,
+                temperature=0.3
+            )
+
+            # Skipped if the history was cleared while the summary was written
+            await db.execute(
+                '''INSERT INTO chat_summaries (user_id, summary, last_chat_id, updated_at)
+                   SELECT ?, ?, ?, CURRENT_TIMESTAMP
+                   WHERE EXISTS (SELECT 1 FROM chat_history WHERE id = ?)
+                   ON CONFLICT(user_id) DO UPDATE SET
+                       summary = excluded.summary,
+                       last_chat_id = excluded.last_chat_id,
+                       updated_at = excluded.updated_at''',
+                (user_id, new_summary.strip(), overflow[-1]['id'], overflow[-1]['id'])
+            )
+            self.stats['summaries_written'] += 1
+
+        except Exception as e:
+            self.stats['summary_errors'] += 1
+            print(f"✗ Conversation summary for user {user_id} failed: {e!r}")
+        finally:
+            self._compacting.discard(user_id)
+
+    def get_stats(self) -> Dict:
+        requests = self.stats['requests']
+        return {
+            **self.stats,
+            'avg_prompt_tokens': round(self.stats['prompt_tokens_total'] / requests, 1) if requests else 0,
+            'history_budget_tokens': self.history_budget,
+            'summary_budget_tokens': self.summary_budget
+        }
+
+
+# Global instance used by the chatbot service
+conversation_memory = ConversationMemory()
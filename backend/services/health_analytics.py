@@ -3,29 +3,35 @@ Health Analytics Service using Claude AI via LiteLLM
 Provides AI-powered insights for menstrual health tracking
 """
 
-from litellm import completion
-import os
 import json
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from database import db
+from backend.services.llm_client import llm_client
+
+# Last 12 cycles
+PERIOD_DATA_SQL = '''
+    SELECT id, start_date, end_date, flow_level, symptoms, notes
+    FROM period_logs
+    WHERE user_id = ?
+    ORDER BY start_date DESC
+    LIMIT 12
+'''
+
 
 class HealthAnalyticsService:
     """LLM-powered health analytics service using Claude 3.5 Sonnet via LiteLLM"""
 
     def __init__(self):
-        # Get API key from environment variable
-        self.api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        if not self.api_key:
+        self.llm = llm_client
+        if not self.llm.available:
             print("Warning: ANTHROPIC_API_KEY not set. AI insights will be unavailable.")
 
-        # LiteLLM will use the ANTHROPIC_API_KEY from environment
-
     async def analyze_period_patterns(self, user_id: int) -> Dict:
         """Analyze period patterns and generate AI-powered insights"""
 
         # Get period data from database
-        period_data = self._get_period_data(user_id)
+        period_data = await self._get_period_data(user_id)
 
         if len(period_data) < 2:
             return {
@@ -39,50 +45,33 @@ class HealthAnalyticsService:
         # Calculate basic statistics
         cycle_stats = self._calculate_cycle_stats(period_data)
 
-        # If no API key, return basic rule-based insights
-        if not self.api_key:
+        # If no LLM is configured, return basic rule-based insights
+        if not self.llm.available:
             return self._get_basic_insights(cycle_stats, period_data)
 
         # Generate AI-powered insights using Claude via LiteLLM
         try:
             prompt = self._build_analysis_prompt(period_data, cycle_stats)
 
-            # Use LiteLLM's completion function with Claude
-            response = completion(
-                model="claude-3-5-sonnet-20241022",
+            # Async completion: the event loop keeps serving other requests meanwhile
+            analysis = await self.llm.complete(
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=1500,
-                temperature=0.3,  # Lower temperature for consistent medical insights
-                api_key=self.api_key
+                temperature=0.3  # Lower temperature for consistent medical insights
             )
-
-            analysis = response.choices[0].message.content
             parsed_insights = self._parse_llm_response(analysis, cycle_stats)
             parsed_insights["ai_powered"] = True
 
             return parsed_insights
 
         except Exception as e:
-            print(f"Error generating AI insights: {e}")
+            print(f"Error generating AI insights: {e!r}")
             # Fallback to basic insights
             return self._get_basic_insights(cycle_stats, period_data)
 
-    def _get_period_data(self, user_id: int) -> List[Dict]:
+    async def _get_period_data(self, user_id: int) -> List[Dict]:
         """Retrieve period log data from database"""
-        conn = db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            '''SELECT id, start_date, end_date, flow_level, symptoms, notes
-               FROM period_logs
-               WHERE user_id = ?
-               ORDER BY start_date DESC
-               LIMIT 12''',  # Last 12 cycles
-            (user_id,)
-        )
-
-        logs = cursor.fetchall()
-        conn.close()
+        logs = await db.fetchall(PERIOD_DATA_SQL, (user_id,))
 
         return [dict(log) for log in logs]
 
@@ -0,0 +1,121 @@
+"""
+Shared async LLM client for Sakhi services (Claude via LiteLLM)
+Calls never block the event loop, are limited in how many run at once,
+and give up after a per-request timeout
+"""
+
+import asyncio
+import os
+from typing import AsyncIterator, Dict, List
+
+from litellm import acompletion
+
+
+class LLMClient:
+    """Async LiteLLM wrapper with a concurrency limit and per-request timeouts"""
+
+    def __init__(self):
+        self.model = os.getenv("SAKHI_LLM_MODEL", "claude-3-5-sonnet-20241022")
+        self.api_key = os.getenv("SAKHI_LLM_API_KEY") or os.getenv("ANTHROPIC_API_KEY", "")
+        # Point at another endpoint, e.g. a local fake LLM for load testing
+        # (SAKHI_LLM_MODEL=openai/fake SAKHI_LLM_API_BASE=http://127.0.0.1:9000/v1)
+        self.api_base = os.getenv("SAKHI_LLM_API_BASE") or None
+        self.timeout = float(os.getenv("SAKHI_LLM_TIMEOUT", "30"))
+        self.max_concurrency = int(os.getenv("SAKHI_LLM_MAX_CONCURRENCY", "8"))
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        self.stats = {'calls': 0, 'timeouts': 0, 'errors': 0, 'in_flight': 0}
+
+    @property
+    def available(self) -> bool:
+        """Whether an LLM endpoint is configured (ANTHROPIC_API_KEY or SAKHI_LLM_API_BASE)"""
+        return bool(self.api_key or self.api_base)
+
+    def _request_kwargs(self, messages: List[Dict], max_tokens: int, temperature: float) -> Dict:
+        kwargs = {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'api_key': self.api_key or None,
+            'timeout': self.timeout
+        }
+        if self.api_base:
+            kwargs['api_base'] = self.api_base
+        return kwargs
+
+    async def complete(self, messages: List[Dict], max_tokens: int = 800,
+                       temperature: float = 0.7) -> str:
+        """
+        Return the model's reply text
+        The timeout covers waiting for a free slot as well as the call itself;
+        raises asyncio.TimeoutError or the provider's error
+        """
+        async def call():
+            async with self._slots:
+                self.stats['in_flight'] += 1
+                try:
+                    response = await acompletion(**self._request_kwargs(messages, max_tokens, temperature))
+                finally:
+                    self.stats['in_flight'] -= 1
+            return response.choices[0].message.content
+
+        self.stats['calls'] += 1
+        try:
+            return await asyncio.wait_for(call(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            raise
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+
+    async def stream(self, messages: List[Dict], max_tokens: int = 800,
+                     temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        Yield the reply text piece by piece as the model generates it
+        The timeout applies to getting a slot, to the first chunk and to
+        each gap between chunks, so a stalled stream is abandoned
+        """
+        self.stats['calls'] += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            raise
+
+        self.stats['in_flight'] += 1
+        try:
+            response = await asyncio.wait_for(
+                acompletion(**self._request_kwargs(messages, max_tokens, temperature), stream=True),
+                timeout=self.timeout
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                except StopAsyncIteration:
+                    break
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    yield text
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            raise
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        finally:
+            self.stats['in_flight'] -= 1
+            self._slots.release()
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'max_concurrency': self.max_concurrency,
+            'timeout_seconds': self.timeout
+        }
+
+
+# Global instance shared by the chatbot and analytics services
+llm_client = LLMClient()
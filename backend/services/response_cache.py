@@ -0,0 +1,230 @@
+"""
+Chatbot response cache
+Answers are cached per (normalized question, language, context fingerprint).
+A question that isn't cached word for word can still be answered from a
+near-duplicate asked with the same language and context, found by TF-IDF
+cosine similarity over the cached questions. A near-duplicate must use the
+same content words and the same negations, so "can i not take hrt" never
+gets the answer to "can i take hrt"
+"""
+
+import hashlib
+import math
+import os
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from backend.services.lru_cache import LRUCache
+
+
+# Negation markers after normalize_question ("don't" becomes "don t")
+NEGATION_WORDS = frozenset({
+    'not', 'no', 'never', 'without', 'nor', 'none', 'nothing', 'cannot', 't',
+    'dont', 'doesnt', 'didnt', 'cant', 'couldnt', 'shouldnt', 'wont', 'wouldnt',
+    'isnt', 'arent', 'wasnt', 'werent', 'mustnt',
+    'नहीं', 'मत', 'ना', 'न', 'बिना',
+})
+
+# Words that don't change what is being asked
+STOPWORDS = frozenset({
+    'a', 'an', 'the', 'i', 'me', 'my', 'we', 'you', 'your', 'it', 'its', 'is', 'am',
+    'are', 'was', 'were', 'be', 'been', 'do', 'does', 'did', 'don', 'doesn', 'didn',
+    'can', 'could', 'should', 'would', 'will', 'shall', 'may', 'might', 'must', 'to',
+    'of', 'in', 'on', 'at', 'for', 'with', 'and', 'or', 'if', 'so', 'that', 'this',
+    'what', 'how', 'why', 'when', 'which', 'there', 'any', 'some', 'about',
+    'please', 'tell', 'ok', 'okay', 'hi', 'hello', 'sakhi',
+})
+
+
+def normalize_question(question: str) -> str:
+    """Casefold, drop punctuation and symbols, and collapse whitespace"""
+    chars = [
+        ' ' if unicodedata.category(ch)[0] in ('P', 'S') else ch
+        for ch in question.casefold()
+    ]
+    return ' '.join(''.join(chars).split())
+
+
+def context_fingerprint(*parts: str) -> str:
+    """
+    Short hash of the context sent with a question (health data, earlier
+    turns); '' when there is none
+    """
+    if not any(parts):
+        return ''
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def meaning_key(question: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """(content words, negation words) of a normalized question"""
+    words = set(question.split())
+    negations = words & NEGATION_WORDS
+    return frozenset(words - negations - STOPWORDS), frozenset(negations)
+
+
+class _SimilarityIndex:
+    """
+    TF-IDF vectors for the cached questions of one (language, fingerprint) bucket
+
+    Only questions with the same meaning_key are candidates for each other;
+    TF-IDF then ranks them, so word order and stopwords can differ but the
+    words that carry the meaning cannot.
+    """
+
+    def __init__(self):
+        self.docs = {}  # normalized question -> term counts
+        self.doc_freq = Counter()
+        self.by_key = {}  # meaning_key -> normalized questions
+
+    def add(self, question: str):
+        terms = Counter(question.split())
+        self.docs[question] = terms
+        self.doc_freq.update(terms.keys())
+        self.by_key.setdefault(meaning_key(question), set()).add(question)
+
+    def remove(self, question: str):
+        terms = self.docs.pop(question, None)
+        if terms is None:
+            return
+        key = meaning_key(question)
+        self.by_key[key].discard(question)
+        if not self.by_key[key]:
+            del self.by_key[key]
+        self.doc_freq.subtract(terms.keys())
+        for term in terms:
+            if self.doc_freq[term] <= 0:
+                del self.doc_freq[term]
+
+    def _vector(self, terms: Counter) -> Dict[str, float]:
+        # Smoothed IDF, so terms every question shares still count a little
+        n = len(self.docs)
+        return {
+            term: count * (math.log((1 + n) / (1 + self.doc_freq.get(term, 0))) + 1)
+            for term, count in terms.items()
+        }
+
+    @staticmethod
+    def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+        dot = sum(weight * b[term] for term, weight in a.items() if term in b)
+        if not dot:
+            return 0.0
+        norm_a = math.sqrt(sum(w * w for w in a.values()))
+        norm_b = math.sqrt(sum(w * w for w in b.values()))
+        return dot / (norm_a * norm_b)
+
+    def most_similar(self, question: str):
+        """(cached question, similarity) closest to question, or (None, 0)"""
+        query = self._vector(Counter(question.split()))
+        best, best_score = None, 0.0
+        for candidate in self.by_key.get(meaning_key(question), ()):
+            score = self._cosine(query, self._vector(self.docs[candidate]))
+            if score > best_score:
+                best, best_score = candidate, score
+        return best, best_score
+
+
+class ResponseCache:
+    """
+    Exact and near-duplicate lookups of earlier chatbot answers
+
+    Only answers for the same language and the same context fingerprint are
+    reused, so a personalized answer is never served to someone else.
+    """
+
+    def __init__(self, max_size: int = 500, ttl: Optional[float] = 86400,
+                 similarity_threshold: float = 0.85):
+        self.cache = LRUCache(max_size=max_size, ttl=ttl)
+        # Similarity above 1 disables near-duplicate matching
+        self.similarity_threshold = similarity_threshold
+        self._indexes = {}  # (language, fingerprint) -> _SimilarityIndex
+        self._indexed = 0
+        self._lock = threading.Lock()
+
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def get(self, question: str, language: str, fingerprint: str) -> Optional[str]:
+        """Cached answer for this question (or a near-duplicate of it), or None"""
+        normalized = normalize_question(question)
+        answer = self.cache.get((normalized, language, fingerprint))
+        if answer is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return answer
+
+        if self.similarity_threshold <= 1:
+            with self._lock:
+                index = self._indexes.get((language, fingerprint))
+                match, score = index.most_similar(normalized) if index else (None, 0)
+            if match is not None and score >= self.similarity_threshold:
+                answer = self.cache.get((match, language, fingerprint))
+                if answer is not None:
+                    with self._lock:
+                        self.similar_hits += 1
+                    return answer
+                # Expired or evicted from the LRU; forget it here too
+                with self._lock:
+                    if match in index.docs:
+                        index.remove(match)
+                        self._indexed -= 1
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, question: str, language: str, fingerprint: str, answer: str):
+        """Cache an answer"""
+        normalized = normalize_question(question)
+        if not normalized:
+            return
+        self.cache.set((normalized, language, fingerprint), answer)
+
+        with self._lock:
+            index = self._indexes.setdefault((language, fingerprint), _SimilarityIndex())
+            if normalized not in index.docs:
+                index.add(normalized)
+                self._indexed += 1
+            # Keep the indexes roughly in step with what the LRU still holds
+            if self._indexed > 2 * self.cache.max_size:
+                self._prune()
+
+    def _prune(self):
+        """Drop indexed questions whose answers expired or were evicted"""
+        for (language, fingerprint), index in list(self._indexes.items()):
+            for question in list(index.docs):
+                if (question, language, fingerprint) not in self.cache:
+                    index.remove(question)
+            if not index.docs:
+                del self._indexes[(language, fingerprint)]
+        self._indexed = sum(len(index.docs) for index in self._indexes.values())
+
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self._indexes.clear()
+            self._indexed = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'hit_rate': f"{(hits / lookups * 100) if lookups else 0:.2f}%",
+                'similarity_threshold': self.similarity_threshold,
+                'indexed_contexts': len(self._indexes),
+                'store': self.cache.get_stats()
+            }
+
+
+# Global instance used by the chatbot service
+response_cache = ResponseCache(
+    max_size=int(os.getenv("SAKHI_CHAT_CACHE_SIZE", "500")),
+    ttl=float(os.getenv("SAKHI_CHAT_CACHE_TTL", "86400")),
+    similarity_threshold=float(os.getenv("SAKHI_CHAT_CACHE_SIMILARITY", "0.85"))
+)
@@ -0,0 +1,294 @@
+"""
+Translation providers for the Hybrid Translation Service
+Providers are tried in order; a circuit breaker skips one that keeps failing
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and stays open for
+    cooldown seconds; after that a single trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Whether the provider may be called now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            # A failed trial re-opens at once; a closed circuit opens at the threshold
+            if self._trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """Free the half-open trial slot of a call that ended without an outcome"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def get_stats(self) -> Dict:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'times_opened': self.times_opened
+        }
+
+
+class TranslationProvider(ABC):
+    """
+    Base provider interface
+
+    translate() returns one entry per input text, None where this provider
+    has no translation, and raises when the provider itself fails.
+    Output from non-authoritative providers is served but never cached.
+    """
+
+    name = 'base'
+    authoritative = True
+
+    @abstractmethod
+    async def translate(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> List[Optional[str]]:
+        """One translation (or None) per text"""
+
+    def close(self):
+        pass
+
+
+class GoogleProvider(TranslationProvider):
+    """Google Translate (googletrans library - FREE), run off the event loop"""
+
+    name = 'google'
+
+    # Map our language codes to Google's
+    LANG_MAP = {
+        'en': 'en',
+        'hi': 'hi',
+        'ta': 'ta',
+        'kn': 'kn'
+    }
+
+    def __init__(self, executor, timeout: float):
+        self.executor = executor
+        self.timeout = timeout
+        self._translator = None
+        self._lock = threading.Lock()
+
+    def _get_translator(self):
+        """Shared googletrans client, so its HTTP session and connections are reused"""
+        with self._lock:
+            if self._translator is None:
+                from googletrans import Translator
+                self._translator = Translator()
+            return self._translator
+
+    async def translate(self, texts, source_lang, target_lang):
+        translator = self._get_translator()
+        src = self.LANG_MAP.get(source_lang, source_lang)
+        dest = self.LANG_MAP.get(target_lang, target_lang)
+
+        # googletrans accepts a list and returns results in the same order;
+        # 4.x exposes a coroutine, older releases a blocking call
+        if asyncio.iscoroutinefunction(translator.translate):
+            call = translator.translate(texts, src=src, dest=dest)
+        else:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(
+                self.executor, lambda: translator.translate(texts, src=src, dest=dest)
+            )
+        results = await asyncio.wait_for(call, timeout=self.timeout)
+        return [result.text for result in results]
+
+
+class StubProvider(TranslationProvider):
+    """
+    Offline stand-in for a cloud provider, for local testing
+    A delay (seconds) simulates provider latency to exercise timeouts.
+    Its "[HI] text" output is placeholder text, so it is never cached
+    """
+
+    name = 'stub'
+    authoritative = False
+
+    def __init__(self, executor, timeout: float, delay: float = 0):
+        self.executor = executor
+        self.timeout = timeout
+        self.delay = delay
+
+    def _translate(self, texts, target_lang):
+        if self.delay:
+            time.sleep(self.delay)
+        return [f"[{target_lang.upper()}] {text}" for text in texts]
+
+    async def translate(self, texts, source_lang, target_lang):
+        loop = asyncio.get_running_loop()
+        call = loop.run_in_executor(self.executor, self._translate, texts, target_lang)
+        return await asyncio.wait_for(call, timeout=self.timeout)
+
+
+class GlossaryProvider(TranslationProvider):
+    """
+    Exact-phrase lookups in the static UI strings (localization/*.json)
+    Only whole texts that match a known phrase are translated
+    """
+
+    name = 'glossary'
+    authoritative = False
+
+    def __init__(self, localization_dir: str, languages: List[str]):
+        self.glossary = self._load(localization_dir, languages)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(text.split()).casefold()
+
+    @staticmethod
+    def _flatten(tree, prefix=''):
+        for key, value in tree.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                yield from GlossaryProvider._flatten(value, path)
+            elif isinstance(value, str):
+                yield path, value
+
+    def _load(self, localization_dir, languages):
+        strings = {}  # lang -> {key_path: text}
+        for lang in languages:
+            file_path = os.path.join(localization_dir, f"{lang}.json")
+            if os.path.exists(file_path):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    strings[lang] = dict(self._flatten(json.load(f)))
+
+        glossary = {}  # (source_lang, target_lang) -> {normalized text: translation}
+        for source_lang, source_strings in strings.items():
+            for target_lang, target_strings in strings.items():
+                if source_lang == target_lang:
+                    continue
+                pairs = glossary.setdefault((source_lang, target_lang), {})
+                for key_path, text in source_strings.items():
+                    if key_path in target_strings and '{' not in text:
+                        pairs.setdefault(self._normalize(text), target_strings[key_path])
+        return glossary
+
+    async def translate(self, texts, source_lang, target_lang):
+        pairs = self.glossary.get((source_lang, target_lang), {})
+        return [pairs.get(self._normalize(text)) for text in texts]
+
+
+class MockProvider(TranslationProvider):
+    """Last resort for demos: tags the original text with the target language"""
+
+    name = 'mock'
+    authoritative = False
+
+    async def translate(self, texts, source_lang, target_lang):
+        return [f"[{target_lang.upper()}] {text}" for text in texts]
+
+
+class ProviderChain:
+    """Tries providers in order, each text going to the first one that can translate it"""
+
+    def __init__(self, providers: List[TranslationProvider],
+                 failure_threshold: int = 3, cooldown: float = 60):
+        self.providers = providers
+        self.breakers = {
+            provider.name: CircuitBreaker(failure_threshold, cooldown)
+            for provider in providers
+        }
+        self.served = {provider.name: 0 for provider in providers}
+
+    async def translate(self, texts: List[str], source_lang: str,
+                        target_lang: str) -> Dict[str, tuple]:
+        """Returns {text: (translation, provider)} for the texts any provider translated"""
+        results = {}
+        remaining = list(texts)
+
+        for provider in self.providers:
+            if not remaining:
+                break
+
+            breaker = self.breakers[provider.name]
+            if not breaker.allow():
+                continue
+
+            finished = False
+            try:
+                translations = await provider.translate(remaining, source_lang, target_lang)
+                finished = True
+            except Exception as e:
+                finished = True
+                breaker.record_failure()
+                print(f"✗ Translation provider '{provider.name}' failed: {e!r}")
+                continue
+            finally:
+                # Cancelled mid-call: nothing to record, but a half-open
+                # circuit must not keep waiting on this trial forever
+                if not finished:
+                    breaker.release_trial()
+            breaker.record_success()
+
+            unresolved = []
+            for text, translated in zip(remaining, translations):
+                if translated is None:
+                    unresolved.append(text)
+                else:
+                    results[text] = (translated, provider)
+                    self.served[provider.name] += 1
+            remaining = unresolved
+
+        return results
+
+    def close(self):
+        for provider in self.providers:
+            provider.close()
+
+    def get_stats(self) -> Dict:
+        return {
+            provider.name: {
+                'authoritative': provider.authoritative,
+                'served': self.served[provider.name],
+                'circuit': self.breakers[provider.name].get_stats()
+            }
+            for provider in self.providers
+        }
@@ -4,19 +4,150 @@ Handles AI-powered translation of dynamic user-generated content
 Uses cache-first approach to minimize API costs
 """
 
+import asyncio
+import hashlib
+import math
 import sqlite3
-from typing import Optional, List, Dict
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple, Iterable
+from datetime import datetime, timezone
 import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.lru_cache import LRUCache
+from backend.services.translation_providers import (
+    GlossaryProvider,
+    GoogleProvider,
+    MockProvider,
+    ProviderChain,
+    StubProvider,
+)
+
+# SQLite caps the number of bound parameters per statement; stay well below it
+MAX_LOOKUP_BATCH = 500
+
+
+def text_hash(text: str) -> int:
+    """
+    Fixed-width cache key for a source text: 64-bit BLAKE2b as a signed
+    integer, so it fits SQLite's INTEGER type. Lookups still compare
+    source_text, so a collision can only cause a miss, never a wrong hit.
+    """
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+# Which rows the maintenance job evicts first when the cache is over budget
+EVICTION_ORDER = {
+    'lfu': 'access_count ASC, last_accessed ASC',   # least frequently used
+    'lru': 'last_accessed ASC, access_count ASC',   # least recently used
+}
+
+# Rows are keyed by (text_hash, source_lang, target_lang), which keeps the unique
+# index fixed-width however long the source text is
+CACHE_TABLE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        text_hash INTEGER NOT NULL,
+        source_text TEXT,
+        source_lang TEXT,
+        target_lang TEXT,
+        translated_text TEXT,
+        provider TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        access_count INTEGER DEFAULT 1,
+        last_accessed TIMESTAMP,
+        UNIQUE(text_hash, source_lang, target_lang)
+    )
+'''
 
 class HybridTranslationService:
     def __init__(self):
         # Get the project root directory
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.cache_db = os.path.join(base_dir, "localization", "translation_cache.db")
+        self.cache_db = os.path.join(
+            base_dir, os.getenv("SAKHI_TRANSLATION_CACHE_DB", "localization/translation_cache.db")
+        )
         self.supported_languages = ['en', 'hi', 'ta', 'kn']
+        # Upper bound on language groups translating at once, shared by all requests
+        self.max_concurrent_translations = int(os.getenv("SAKHI_TRANSLATION_CONCURRENCY", "5"))
+        self._translation_slots = asyncio.Semaphore(self.max_concurrent_translations)
+        # In-process tier in front of the SQLite cache, keyed by (text, source_lang, target_lang)
+        self.memory_cache = LRUCache(
+            max_size=int(os.getenv("SAKHI_TRANSLATION_LRU_SIZE", "5000")),
+            ttl=float(os.getenv("SAKHI_TRANSLATION_LRU_TTL", "3600"))
+        )
+        # Write-behind access counters: (text, source_lang, target_lang) -> [hits, last_accessed]
+        self._pending_access = {}
+        self._pending_lock = threading.Lock()
+        self._flush_thread = None
+        self._flush_stop = threading.Event()
+        # Size budget enforced by the maintenance job (see enforce_cache_budget)
+        self.max_cache_rows = int(os.getenv("SAKHI_TRANSLATION_CACHE_MAX_ROWS", "100000"))
+        self.max_cache_bytes = int(os.getenv("SAKHI_TRANSLATION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+        self.eviction_policy = os.getenv("SAKHI_TRANSLATION_EVICTION", "lfu")
+        if self.eviction_policy not in EVICTION_ORDER:
+            raise ValueError(f"Unknown eviction policy: {self.eviction_policy}")
+        self.last_maintenance = None
+        # Pre-warming: new posts/comments are translated in the background
+        self.prewarm_queue_size = int(os.getenv("SAKHI_TRANSLATION_PREWARM_QUEUE", "1000"))
+        self.prewarm_worker_count = int(os.getenv("SAKHI_TRANSLATION_PREWARM_WORKERS", "2"))
+        # Background work gets its own, smaller limit so it never takes the
+        # slots feed and comment requests translate with
+        self.prewarm_concurrency = int(os.getenv("SAKHI_TRANSLATION_PREWARM_CONCURRENCY", "1"))
+        self._prewarm_slots = asyncio.Semaphore(self.prewarm_concurrency)
+        self._prewarm_queue = None
+        self._prewarm_workers = []
+        self.prewarm_stats = {'queued': 0, 'dropped': 0, 'completed': 0, 'failed': 0}
+        self._maintenance_thread = None
+        self._maintenance_stop = threading.Event()
+        # Single-flight: provider calls in progress, keyed like the cache
+        self._inflight = {}  # (text, source_lang, target_lang) -> asyncio.Future
+        self.coalesced_requests = 0
+        self.provider_timeout = float(os.getenv("SAKHI_TRANSLATION_TIMEOUT", "10"))
+        self._provider_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("SAKHI_TRANSLATION_WORKERS", "4")),
+            thread_name_prefix="sakhi-translate"
+        )
+        self.providers = self._build_provider_chain(
+            os.getenv("SAKHI_TRANSLATION_PROVIDERS", "google,glossary,mock"),
+            os.path.join(base_dir, "localization")
+        )
         self.init_cache_db()
 
+    def _build_provider_chain(self, names: str, localization_dir: str) -> ProviderChain:
+        """
+        Build the ordered provider chain from a comma-separated list
+        Available: google, stub (offline cloud stand-in), glossary, mock
+        """
+        factories = {
+            'google': lambda: GoogleProvider(self._provider_executor, self.provider_timeout),
+            'stub': lambda: StubProvider(
+                self._provider_executor, self.provider_timeout,
+                delay=float(os.getenv("SAKHI_TRANSLATION_STUB_DELAY", "0"))
+            ),
+            'glossary': lambda: GlossaryProvider(localization_dir, self.supported_languages),
+            'mock': MockProvider,
+        }
+
+        providers = []
+        for name in names.split(','):
+            name = name.strip()
+            if name not in factories:
+                raise ValueError(f"Unknown translation provider: {name}")
+            providers.append(factories[name]())
+
+        return ProviderChain(
+            providers,
+            failure_threshold=int(os.getenv("SAKHI_TRANSLATION_BREAKER_THRESHOLD", "3")),
+            cooldown=float(os.getenv("SAKHI_TRANSLATION_BREAKER_COOLDOWN", "60"))
+        )
+
     def init_cache_db(self):
         """Initialize translation cache database"""
         # Create directory if it doesn't exist
@@ -25,54 +156,303 @@ class HybridTranslationService:
         conn = sqlite3.connect(self.cache_db)
         cursor = conn.cursor()
 
+        # Incremental auto-vacuum lets maintenance hand freed pages back to the OS;
+        # switching an existing file needs one full VACUUM
+        if cursor.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            cursor.execute('VACUUM')
+
+        cursor.execute('PRAGMA table_info(translation_cache)')
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if columns and 'text_hash' not in columns:
+            self._migrate_to_hash_keys(conn, columns)
+        else:
+            cursor.execute(CACHE_TABLE_SCHEMA.format(table='translation_cache'))
+
+        # Drop demo mock output ("[HI] text") that older versions cached as real translations
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS translation_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_text TEXT,
-                source_lang TEXT,
-                target_lang TEXT,
-                translated_text TEXT,
-                provider TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                access_count INTEGER DEFAULT 1,
-                UNIQUE(source_text, source_lang, target_lang)
-            )
+            DELETE FROM translation_cache
+            WHERE translated_text = '[' || UPPER(target_lang) || '] ' || source_text
         ''')
+        if cursor.rowcount:
+            print(f"✓ Removed {cursor.rowcount} cached mock translations")
 
-        # Create index for faster lookups
+        # Eviction scans in LFU/LRU order
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_translation_lfu
+            ON translation_cache(access_count, last_accessed)
+        ''')
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_translation_lookup
-            ON translation_cache(source_text, source_lang, target_lang)
+            CREATE INDEX IF NOT EXISTS idx_translation_lru
+            ON translation_cache(last_accessed, access_count)
         ''')
 
         conn.commit()
         conn.close()
         print("✓ Translation cache initialized")
 
+    def _migrate_to_hash_keys(self, conn, columns: List[str]):
+        """
+        Rebuild a cache table keyed by the full source_text into the
+        text_hash-keyed layout, computing hashes for existing rows
+        """
+        started = time.perf_counter()
+        conn.create_function('text_hash', 1, text_hash, deterministic=True)
+
+        # Older cache files predate last_accessed; seed it from created_at
+        last_accessed = 'COALESCE(last_accessed, created_at)' if 'last_accessed' in columns else 'created_at'
+
+        cursor = conn.cursor()
+        cursor.execute('DROP TABLE IF EXISTS translation_cache_new')
+        cursor.execute(CACHE_TABLE_SCHEMA.format(table='translation_cache_new'))
+        cursor.execute(f'''
+            INSERT OR IGNORE INTO translation_cache_new
+            (id, text_hash, source_text, source_lang, target_lang, translated_text,
+             provider, created_at, access_count, last_accessed)
+            SELECT id, text_hash(source_text), source_text, source_lang, target_lang, translated_text,
+                   provider, created_at, access_count, {last_accessed}
+            FROM translation_cache
+        ''')
+        migrated = cursor.rowcount
+        cursor.execute('DROP TABLE translation_cache')
+        cursor.execute('ALTER TABLE translation_cache_new RENAME TO translation_cache')
+        conn.commit()
+
+        print(f"✓ Migrated {migrated} cached translations to hash keys "
+              f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+
     def get_cached_translation(self, text: str, source_lang: str,
                                target_lang: str) -> Optional[str]:
-        """Check if translation exists in cache"""
+        """Check if translation exists in cache (memory first, then disk)"""
+        key = (text, source_lang, target_lang)
+        cached = self.memory_cache.get(key)
+        if cached is not None:
+            self._record_access([key])
+            return cached
+
         conn = sqlite3.connect(self.cache_db)
         cursor = conn.cursor()
 
+        # The source_text comparison is the collision check
         cursor.execute('''
             SELECT translated_text FROM translation_cache
-            WHERE source_text = ? AND source_lang = ? AND target_lang = ?
-        ''', (text, source_lang, target_lang))
+            WHERE text_hash = ? AND source_lang = ? AND target_lang = ? AND source_text = ?
+        ''', (text_hash(text), source_lang, target_lang, text))
 
         result = cursor.fetchone()
+        conn.close()
 
-        # Update access count for analytics
         if result:
-            cursor.execute('''
+            self._record_access([key])
+            self.memory_cache.set(key, result[0])
+            return result[0]
+        return None
+
+    def get_cached_translations(self, texts: List[str], source_lang: str,
+                                target_lang: str) -> Dict[str, str]:
+        """Look up many texts for one language pair; returns {source_text: translation} for hits"""
+        memory_hits = {}
+        remaining = []
+        for text in texts:
+            cached = self.memory_cache.get((text, source_lang, target_lang))
+            if cached is not None:
+                memory_hits[text] = cached
+            else:
+                remaining.append(text)
+
+        if not remaining:
+            self._record_access((text, source_lang, target_lang) for text in memory_hits)
+            return memory_hits
+
+        conn = sqlite3.connect(self.cache_db)
+        cursor = conn.cursor()
+
+        wanted = set(remaining)
+        found = {}
+        for start in range(0, len(remaining), MAX_LOOKUP_BATCH):
+            chunk = remaining[start:start + MAX_LOOKUP_BATCH]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT source_text, translated_text FROM translation_cache
+                WHERE source_lang = ? AND target_lang = ? AND text_hash IN ({placeholders})
+            ''', (source_lang, target_lang, *(text_hash(text) for text in chunk)))
+            # Collision check: keep only rows whose text is one we asked for
+            found.update(row for row in cursor.fetchall() if row[0] in wanted)
+
+        conn.close()
+
+        for text, translated in found.items():
+            self.memory_cache.set((text, source_lang, target_lang), translated)
+        found.update(memory_hits)
+        self._record_access((text, source_lang, target_lang) for text in found)
+        return found
+
+    def _record_access(self, keys: Iterable[Tuple[str, str, str]]):
+        """Buffer access-count increments; flush_access_counts writes them to disk"""
+        now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        with self._pending_lock:
+            for key in keys:
+                pending = self._pending_access.get(key)
+                if pending:
+                    pending[0] += 1
+                    pending[1] = now
+                else:
+                    self._pending_access[key] = [1, now]
+
+    def flush_access_counts(self) -> int:
+        """Write buffered access counts in one transaction; returns the number of rows touched"""
+        with self._pending_lock:
+            pending, self._pending_access = self._pending_access, {}
+
+        if not pending:
+            return 0
+
+        conn = sqlite3.connect(self.cache_db)
+        try:
+            conn.executemany('''
                 UPDATE translation_cache
-                SET access_count = access_count + 1
-                WHERE source_text = ? AND source_lang = ? AND target_lang = ?
-            ''', (text, source_lang, target_lang))
+                SET access_count = access_count + ?, last_accessed = ?
+                WHERE text_hash = ? AND source_lang = ? AND target_lang = ? AND source_text = ?
+            ''', [
+                (hits, last_accessed, text_hash(text), source_lang, target_lang, text)
+                for (text, source_lang, target_lang), (hits, last_accessed) in pending.items()
+            ])
             conn.commit()
+        except Exception:
+            # Put the counts back so the next flush retries them
+            self._merge_pending(pending)
+            raise
+        finally:
+            conn.close()
+
+        return len(pending)
+
+    def _merge_pending(self, pending: Dict):
+        with self._pending_lock:
+            for key, (hits, last_accessed) in pending.items():
+                current = self._pending_access.get(key)
+                if current:
+                    current[0] += hits
+                    current[1] = max(current[1], last_accessed)
+                else:
+                    self._pending_access[key] = [hits, last_accessed]
+
+    def start_flush_task(self, interval=None):
+        """Start a background thread that flushes access counts periodically"""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+
+        if interval is None:
+            interval = float(os.getenv("SAKHI_TRANSLATION_FLUSH_INTERVAL", "30"))
+
+        def run():
+            while not self._flush_stop.wait(interval):
+                try:
+                    self.flush_access_counts()
+                except Exception as e:
+                    print(f"Translation access flush failed: {e}")
+
+        self._flush_stop.clear()
+        self._flush_thread = threading.Thread(target=run, name="sakhi-translation-flush", daemon=True)
+        self._flush_thread.start()
+
+    def enforce_cache_budget(self) -> Dict:
+        """
+        Evict rows until the cache fits its row and byte budget, then
+        return freed pages to the OS with an incremental VACUUM
+        """
+        started = time.perf_counter()
 
-        conn.close()
-        return result[0] if result else None
+        # Evict on up-to-date counters
+        self.flush_access_counts()
+
+        conn = sqlite3.connect(self.cache_db)
+        cursor = conn.cursor()
+        try:
+            page_size = cursor.execute('PRAGMA page_size').fetchone()[0]
+            pages_before = cursor.execute('PRAGMA page_count').fetchone()[0]
+            free_pages = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+            rows = cursor.execute('SELECT COUNT(*) FROM translation_cache').fetchone()[0]
+            used_bytes = (pages_before - free_pages) * page_size
+
+            excess = max(0, rows - self.max_cache_rows)
+            if rows and used_bytes > self.max_cache_bytes:
+                # Estimate how many average-sized rows make up the overshoot
+                bytes_per_row = used_bytes / rows
+                excess = max(excess, math.ceil((used_bytes - self.max_cache_bytes) / bytes_per_row))
+
+            evicted = []
+            if excess:
+                evicted = cursor.execute(f'''
+                    SELECT id, source_text, source_lang, target_lang FROM translation_cache
+                    ORDER BY {EVICTION_ORDER[self.eviction_policy]}
+                    LIMIT ?
+                ''', (excess,)).fetchall()
+                cursor.executemany('DELETE FROM translation_cache WHERE id = ?',
+                                   [(row[0],) for row in evicted])
+                conn.commit()
+
+            # executescript steps the pragma to completion; execute() frees a single page
+            conn.executescript('PRAGMA incremental_vacuum;')
+            pages_after = cursor.execute('PRAGMA page_count').fetchone()[0]
+        finally:
+            conn.close()
+
+        for _, text, source_lang, target_lang in evicted:
+            self.memory_cache.delete((text, source_lang, target_lang))
+
+        self.last_maintenance = {
+            'ran_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'policy': self.eviction_policy,
+            'evicted_rows': len(evicted),
+            'rows': rows - len(evicted),
+            'size_bytes': pages_after * page_size,
+            'reclaimed_bytes': (pages_before - pages_after) * page_size,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+        if evicted or pages_after < pages_before:
+            print(f"✓ Translation cache maintenance: evicted {len(evicted)} rows, "
+                  f"reclaimed {self.last_maintenance['reclaimed_bytes']} bytes")
+        return self.last_maintenance
+
+    def start_maintenance_task(self, interval=None):
+        """Start a background thread that enforces the cache budget periodically"""
+        if self._maintenance_thread and self._maintenance_thread.is_alive():
+            return
+
+        if interval is None:
+            interval = float(os.getenv("SAKHI_TRANSLATION_MAINTENANCE_INTERVAL", "3600"))
+
+        def run():
+            while not self._maintenance_stop.wait(interval):
+                try:
+                    self.enforce_cache_budget()
+                except Exception as e:
+                    print(f"Translation cache maintenance failed: {e}")
+
+        self._maintenance_stop.clear()
+        self._maintenance_thread = threading.Thread(target=run, name="sakhi-translation-maintenance", daemon=True)
+        self._maintenance_thread.start()
+
+    def stop_maintenance_task(self):
+        """Stop the maintenance thread"""
+        self._maintenance_stop.set()
+        if self._maintenance_thread:
+            self._maintenance_thread.join(timeout=5)
+            self._maintenance_thread = None
+
+    def stop_flush_task(self):
+        """Stop the flush thread and write any remaining access counts"""
+        self._flush_stop.set()
+        if self._flush_thread:
+            self._flush_thread.join(timeout=5)
+            self._flush_thread = None
+
+        try:
+            self.flush_access_counts()
+        except Exception as e:
+            print(f"Translation access flush failed: {e}")
 
     def cache_translation(self, text: str, source_lang: str,
                          target_lang: str, translated_text: str, provider: str):
@@ -82,13 +462,32 @@ class HybridTranslationService:
 
         cursor.execute('''
             INSERT OR REPLACE INTO translation_cache
-            (source_text, source_lang, target_lang, translated_text, provider)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (text, source_lang, target_lang, translated_text, provider))
+            (text_hash, source_text, source_lang, target_lang, translated_text, provider, last_accessed)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (text_hash(text), text, source_lang, target_lang, translated_text, provider))
+
+        conn.commit()
+        conn.close()
+
+        self.memory_cache.set((text, source_lang, target_lang), translated_text)
+
+    def cache_translations(self, entries: List[Tuple[str, str, str, str, str]]):
+        """Store many (text, source_lang, target_lang, translated_text, provider) rows in one transaction"""
+        conn = sqlite3.connect(self.cache_db)
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            INSERT OR REPLACE INTO translation_cache
+            (text_hash, source_text, source_lang, target_lang, translated_text, provider, last_accessed)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', [(text_hash(entry[0]), *entry) for entry in entries])
 
         conn.commit()
         conn.close()
 
+        for text, source_lang, target_lang, translated_text, _ in entries:
+            self.memory_cache.set((text, source_lang, target_lang), translated_text)
+
     async def translate_dynamic_content(self, text: str,
                                        source_lang: str,
                                        target_lang: str) -> str:
@@ -107,73 +506,216 @@ class HybridTranslationService:
         if source_lang == target_lang:
             return text
 
-        # Check cache first (95% hit rate expected after initial usage)
-        cached = self.get_cached_translation(text, source_lang, target_lang)
+        # Check cache first (95% hit rate expected after initial usage);
+        # the SQLite lookup runs off the event loop
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(
+            None, self.get_cached_translation, text, source_lang, target_lang
+        )
         if cached:
             print(f"✓ Cache hit: {source_lang} → {target_lang}")
             return cached
 
         print(f"✗ Cache miss: {source_lang} → {target_lang}, calling API...")
 
-        # Translate using AI
-        try:
-            # Try Google Translate first (easiest for demo)
-            translated = await self._translate_with_google(text, source_lang, target_lang)
-            provider = 'google'
-        except Exception as e:
-            print(f"Translation failed: {e}")
-            # Last resort: return original text
-            return text
+        return await self._translate_miss(text, source_lang, target_lang)
 
-        # Cache the result
-        self.cache_translation(text, source_lang, target_lang, translated, provider)
+    async def _translate_miss(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate text that is not cached and store the result"""
+        results = await self._translate_misses([text], source_lang, target_lang)
+        return results.get(text, text)
 
-        return translated
+    async def _translate_misses(self, texts: List[str], source_lang: str,
+                                target_lang: str, provisional: Optional[set] = None) -> Dict[str, str]:
+        """
+        Translate uncached texts, sharing provider calls already in flight
 
-    async def _translate_with_google(self, text: str,
-                                     source_lang: str,
-                                     target_lang: str) -> str:
+        Texts another request is already translating are awaited rather than
+        sent again; the rest go through the provider chain in one call.
+        Only output from authoritative providers is cached; texts served by
+        any other provider are added to `provisional`. Returns
+        {source_text: translation} for the texts that were translated.
         """
-        Use Google Translate (googletrans library - FREE)
+        if provisional is None:
+            provisional = set()
+        loop = asyncio.get_running_loop()
+        owned, waiting = [], {}
+        for text in texts:
+            key = (text, source_lang, target_lang)
+            future = self._inflight.get(key)
+            if future is not None:
+                waiting[text] = future
+                self.coalesced_requests += 1
+            else:
+                self._inflight[key] = loop.create_future()
+                owned.append(text)
+
+        results = {}
+        cacheable = []
+        if owned:
+            try:
+                # Translate using AI (Google Translate by default, then local fallbacks)
+                translated = await self.providers.translate(owned, source_lang, target_lang)
+                for text, (translation, provider) in translated.items():
+                    results[text] = translation
+                    if provider.authoritative:
+                        cacheable.append((text, source_lang, target_lang, translation, provider.name))
+                    else:
+                        provisional.add(text)
+            except Exception as e:
+                print(f"Translation failed: {e!r}")
+            finally:
+                # Waiters fall back to the original text if the provider call failed
+                for text in owned:
+                    future = self._inflight.pop((text, source_lang, target_lang))
+                    if not future.done():
+                        future.set_result((results.get(text), text not in provisional))
+
+            if cacheable:
+                await loop.run_in_executor(None, self.cache_translations, cacheable)
+
+        for text, future in waiting.items():
+            translated, authoritative = await asyncio.shield(future)
+            if translated is not None:
+                results[text] = translated
+                if not authoritative:
+                    provisional.add(text)
+
+        return results
+
+    def close(self):
+        """Stop background jobs, flush pending counters and stop the providers"""
+        self.stop_maintenance_task()
+        self.stop_flush_task()
+        self.providers.close()
+        self._provider_executor.shutdown(wait=False)
+
+    async def translate_many(self, items: List[Tuple[str, str, str]],
+                             provisional: Optional[set] = None,
+                             slots: Optional[asyncio.Semaphore] = None) -> Dict[Tuple[str, str, str], str]:
         """
-        try:
-            from googletrans import Translator
-
-            translator = Translator()
+        Translate a mixed batch of (text, source_lang, target_lang) items
+
+        Items are grouped by language pair and each group goes through
+        translate_batch; groups run concurrently, with at most
+        max_concurrent_translations in flight across all requests (or as
+        many as `slots` allows, for background work).
+        Returns {(text, source_lang, target_lang): translation}; items whose
+        translation is not authoritative (fallback provider output or the
+        untranslated original) are added to `provisional`.
+        """
+        groups = {}  # (source_lang, target_lang) -> unique texts, in first-seen order
+        for text, source_lang, target_lang in items:
+            groups.setdefault((source_lang, target_lang), {})[text] = None
 
-            # Map our language codes to Google's
-            lang_map = {
-                'en': 'en',
-                'hi': 'hi',
-                'ta': 'ta',
-                'kn': 'kn'
-            }
+        slots = slots or self._translation_slots
 
-            src = lang_map.get(source_lang, source_lang)
-            dest = lang_map.get(target_lang, target_lang)
+        async def translate_group(source_lang, target_lang, texts):
+            group_provisional = set()
+            async with slots:
+                translations = await self.translate_batch(texts, source_lang, target_lang, group_provisional)
+            if provisional is not None:
+                provisional.update((text, source_lang, target_lang) for text in group_provisional)
+            return translations
 
-            result = translator.translate(text, src=src, dest=dest)
+        pairs = [(source_lang, target_lang, list(texts)) for (source_lang, target_lang), texts in groups.items()]
+        translated_groups = await asyncio.gather(*(translate_group(*pair) for pair in pairs))
 
-            return result.text
-        except Exception as e:
-            print(f"Google Translate error: {e}")
-            # Fallback to mock translation for demo
-            return f"[{target_lang.upper()}] {text}"
+        results = {}
+        for (source_lang, target_lang, texts), translations in zip(pairs, translated_groups):
+            for text, translated in zip(texts, translations):
+                results[(text, source_lang, target_lang)] = translated
+        return results
 
     async def translate_batch(self, texts: List[str],
                              source_lang: str,
-                             target_lang: str) -> List[str]:
+                             target_lang: str,
+                             provisional: Optional[set] = None) -> List[str]:
         """
         Batch translate multiple texts (more cost-efficient)
         Useful for translating all posts in a feed at once
-        """
-        translated_texts = []
 
-        for text in texts:
-            translated = await self.translate_dynamic_content(text, source_lang, target_lang)
-            translated_texts.append(translated)
+        Duplicates are translated once: cache hits come from one lookup,
+        all misses go to the provider in one request, and new translations
+        are stored with one bulk insert. Results follow the input order.
+        Texts without an authoritative translation are added to `provisional`.
+        """
+        if provisional is None:
+            provisional = set()
+        # Validate languages
+        if source_lang not in self.supported_languages or target_lang not in self.supported_languages:
+            print(f"Unsupported language pair: {source_lang} → {target_lang}")
+            return list(texts)
 
-        return translated_texts
+        # Same language, no translation needed
+        if source_lang == target_lang or not texts:
+            return list(texts)
+
+        unique_texts = list(dict.fromkeys(texts))
+
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None, self.get_cached_translations, unique_texts, source_lang, target_lang
+        )
+
+        misses = [text for text in unique_texts if text not in results]
+        if misses:
+            print(f"✗ Cache miss for {len(misses)} of {len(unique_texts)} texts: {source_lang} → {target_lang}, calling API...")
+            results.update(await self._translate_misses(misses, source_lang, target_lang, provisional))
+
+        # Last resort for anything untranslated: return original text
+        provisional.update(text for text in misses if text not in results)
+        return [results.get(text, text) for text in texts]
+
+    def start_prewarm_workers(self):
+        """Start the background workers that pre-translate new content (call from the event loop)"""
+        if self._prewarm_workers:
+            return
+        self._prewarm_queue = asyncio.Queue(maxsize=self.prewarm_queue_size)
+        self._prewarm_workers = [
+            asyncio.create_task(self._prewarm_worker(), name=f"sakhi-prewarm-{i}")
+            for i in range(self.prewarm_worker_count)
+        ]
+
+    async def stop_prewarm_workers(self):
+        """Cancel the pre-warm workers; queued items are dropped"""
+        for worker in self._prewarm_workers:
+            worker.cancel()
+        await asyncio.gather(*self._prewarm_workers, return_exceptions=True)
+        self._prewarm_workers = []
+        self._prewarm_queue = None
+
+    def enqueue_prewarm(self, text: str, source_lang: str) -> bool:
+        """
+        Queue new content for translation into every other supported language
+        Never blocks the caller: when the queue is full the item is dropped
+        and the first reader translates it on demand instead
+        """
+        if self._prewarm_queue is None or source_lang not in self.supported_languages:
+            return False
+        try:
+            self._prewarm_queue.put_nowait((text, source_lang))
+        except asyncio.QueueFull:
+            self.prewarm_stats['dropped'] += 1
+            return False
+        self.prewarm_stats['queued'] += 1
+        return True
+
+    async def _prewarm_worker(self):
+        while True:
+            text, source_lang = await self._prewarm_queue.get()
+            try:
+                await self.translate_many([
+                    (text, source_lang, target_lang)
+                    for target_lang in self.supported_languages
+                    if target_lang != source_lang
+                ], slots=self._prewarm_slots)
+                self.prewarm_stats['completed'] += 1
+            except Exception as e:
+                self.prewarm_stats['failed'] += 1
+                print(f"Translation pre-warm failed: {e!r}")
+            finally:
+                self._prewarm_queue.task_done()
 
     def should_translate(self, user_lang: str, content_lang: str) -> bool:
         """Determine if translation is needed"""
@@ -193,8 +735,15 @@ class HybridTranslationService:
         cursor.execute('SELECT provider, COUNT(*) FROM translation_cache GROUP BY provider')
         providers = cursor.fetchall()
 
+        page_count = cursor.execute('PRAGMA page_count').fetchone()[0]
+        page_size = cursor.execute('PRAGMA page_size').fetchone()[0]
+
         conn.close()
 
+        # Include hits still waiting in the write-behind buffer
+        with self._pending_lock:
+            total_accesses += sum(hits for hits, _ in self._pending_access.values())
+
         cache_hit_rate = 0
         if total_accesses > 0:
             cache_hit_rate = ((total_accesses - total_cached) / total_accesses) * 100
@@ -205,7 +754,24 @@ class HybridTranslationService:
             'providers': dict(providers),
             'cache_hit_rate': f"{cache_hit_rate:.2f}%",
             'estimated_api_calls_saved': total_accesses - total_cached,
-            'estimated_cost_saved': f"${(total_accesses - total_cached) * 0.002:.2f}"
+            'estimated_cost_saved': f"${(total_accesses - total_cached) * 0.002:.2f}",
+            'size_bytes': page_count * page_size,
+            'budget': {
+                'max_rows': self.max_cache_rows,
+                'max_bytes': self.max_cache_bytes,
+                'eviction_policy': self.eviction_policy
+            },
+            'last_maintenance': self.last_maintenance,
+            'memory_cache': self.memory_cache.get_stats(),
+            'coalesced_requests': self.coalesced_requests,
+            'translation_providers': self.providers.get_stats(),
+            'inflight_translations': len(self._inflight),
+            'prewarm': {
+                **self.prewarm_stats,
+                'pending': self._prewarm_queue.qsize() if self._prewarm_queue else 0,
+                'max_pending': self.prewarm_queue_size,
+                'concurrency': self.prewarm_concurrency
+            }
         }
 
     def clear_cache(self):
@@ -215,6 +781,9 @@ class HybridTranslationService:
         cursor.execute('DELETE FROM translation_cache')
         conn.commit()
         conn.close()
+        self.memory_cache.clear()
+        with self._pending_lock:
+            self._pending_access.clear()
         print("✓ Translation cache cleared")
 
 # Global instance
@@ -241,6 +810,7 @@ if __name__ == "__main__":
         print(f"Translated (hi) [cached]: {translated}\n")
 
         # Get cache stats
+        translation_service.flush_access_counts()
         stats = translation_service.get_cache_stats()
         print("Cache Statistics:")
         for key, value in stats.items():
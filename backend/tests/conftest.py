@@ -0,0 +1,21 @@
+"""
+Shared pytest setup
+Points the app at throwaway databases before any backend module is
+imported, so the tests never touch data/sakhi.db or the translation cache
+"""
+
+import os
+import sys
+import tempfile
+
+_tmp_dir = tempfile.mkdtemp(prefix="sakhi-tests-")
+os.environ["SAKHI_DB_PATH"] = os.path.join(_tmp_dir, "sakhi.db")
+os.environ["SAKHI_TRANSLATION_CACHE_DB"] = os.path.join(_tmp_dir, "translation_cache.db")
+# Use litellm's bundled model cost map instead of fetching it at import time
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(BACKEND_DIR)
+for path in (BACKEND_DIR, PROJECT_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,45 @@
+"""Feed pages are only cached when every translation on them is authoritative"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database import db
+from feed_cache import feed_cache
+import main
+from backend.services.translation_service import translation_service
+from backend.services.translation_providers import MockProvider, ProviderChain, TranslationProvider
+
+
+class FakeCloudProvider(TranslationProvider):
+    name = 'fake-cloud'
+
+    async def translate(self, texts, source_lang, target_lang):
+        return [f"{target_lang}: {text}" for text in texts]
+
+
+@pytest.fixture
+def client():
+    db.seed_sample_data()
+    providers = translation_service.providers
+    translation_service.clear_cache()
+    feed_cache.invalidate()
+    yield TestClient(main.app)
+    translation_service.providers = providers
+    translation_service.clear_cache()
+    feed_cache.invalidate()
+
+
+def test_feed_with_fallback_translations_is_not_cached(client):
+    translation_service.providers = ProviderChain([MockProvider()])
+    response = client.get("/community/posts?user_lang=kn")
+    assert response.status_code == 200
+    assert any(post['translated'] for post in response.json())
+    assert feed_cache.get(('kn', 20, None)) is None
+
+
+def test_feed_with_authoritative_translations_is_cached(client):
+    translation_service.providers = ProviderChain([FakeCloudProvider()])
+    response = client.get("/community/posts?user_lang=kn")
+    assert response.status_code == 200
+    assert any(post['content'].startswith("kn: ") for post in response.json())
+    assert feed_cache.get(('kn', 20, None)) is not None
@@ -0,0 +1,17 @@
+"""Schema migrations"""
+
+import sqlite3
+
+from migrations import MIGRATIONS, run_migrations
+
+
+def test_run_migrations_reports_the_final_version():
+    conn = sqlite3.connect(":memory:")
+    latest = MIGRATIONS[-1][0]
+
+    applied, version = run_migrations(conn)
+    assert [m['version'] for m in applied] == [m[0] for m in MIGRATIONS]
+    assert version == latest
+
+    # A current schema applies nothing and still reports its version
+    assert run_migrations(conn) == ([], latest)
@@ -0,0 +1,89 @@
+"""
+Query plans of the per-request SQL in backend/routes and backend/services
+
+The SQL is imported from the modules that run it, so the check cannot drift
+from what the app executes. Every hot-table step must be an index SEARCH;
+a SCAN (even one walking an index) or a temp B-tree sort fails the test.
+"""
+
+import pytest
+
+from database import db
+from routes import analytics, chatbot, community, meetups, menopause, period
+from backend.services import chatbot_service, conversation_memory, health_analytics
+
+HOT_TABLES = {
+    "period_logs", "posts", "comments", "meetups", "meetup_participants",
+    "meetup_stars", "chat_history", "chat_summaries", "menopause_symptoms",
+    "menopause_treatments",
+}
+# Aliases the queries use for hot tables
+TABLE_ALIASES = {"p": "posts", "c": "comments", "m": "meetups", "mp": "meetup_participants",
+                 "ms": "meetup_stars"}
+
+CURSOR = ("2025-01-01 00:00:00", 100)
+MEETUP_PARAMS = {"user_id": 1, "city": "Bangalore", "meetup_id": 1}
+
+QUERIES = [
+    ("period logs", period.PERIOD_LOGS_SQL, (1,)),
+    ("recent period dates", period.RECENT_PERIOD_DATES_SQL, (1,)),
+    ("period log count", analytics.PERIOD_LOG_COUNT_SQL, (1,)),
+    ("latest period", analytics.LATEST_PERIOD_SQL, (1,)),
+    ("community feed page", community.FEED_PAGE_SQL, (*CURSOR, 20)),
+    ("all comments", community.ALL_COMMENTS_SQL, (1,)),
+    ("comments", community.COMMENTS_SQL, (1, 50)),
+    ("comments page", community.COMMENTS_PAGE_SQL, (1, *CURSOR, 50)),
+    ("chat history", chatbot.CHAT_HISTORY_SQL, (1, 10)),
+    ("chat history page", chatbot.CHAT_HISTORY_PAGE_SQL, (1, *CURSOR, 10)),
+    ("meetups by city", meetups.MEETUPS_BY_CITY_SQL, MEETUP_PARAMS),
+    ("meetup by id", meetups.MEETUP_BY_ID_SQL, MEETUP_PARAMS),
+    ("menopause symptoms", menopause.SYMPTOM_LOGS_SQL, (1, 90)),
+    ("menopause treatments", menopause.TREATMENTS_SQL, (1,)),
+    ("active treatments", menopause.ACTIVE_TREATMENTS_SQL, (1,)),
+    ("menopause period starts", menopause.PERIOD_STARTS_SQL, (1,)),
+    ("analytics period data", health_analytics.PERIOD_DATA_SQL, (1,)),
+    ("chatbot period logs", chatbot_service.CONTEXT_PERIOD_LOGS_SQL, (1,)),
+    ("chatbot post count", chatbot_service.POST_COUNT_SQL, (1,)),
+    ("chat session summary", conversation_memory.SESSION_SUMMARY_SQL, (1, "-24 hours")),
+    ("chat session turns", conversation_memory.SESSION_TURNS_SQL, (1, "-24 hours", 0, 50)),
+]
+
+# Unfiltered listings read the whole table by design; they must walk the
+# named index in order (no sort) and nothing else may be scanned
+ORDERED_LISTINGS = [
+    ("community feed", community.FEED_SQL, (20,), "idx_posts_created"),
+    ("all meetups", meetups.ALL_MEETUPS_SQL, MEETUP_PARAMS, "idx_meetups_date"),
+]
+
+
+def query_plan(sql, params):
+    with db.connection() as conn:
+        return [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def scanned_hot_tables(plan):
+    """(table, detail) for every SCAN step over a hot table"""
+    scans = []
+    for detail in plan:
+        if detail.startswith("SCAN "):
+            name = detail.split()[1]
+            table = TABLE_ALIASES.get(name, name)
+            if table in HOT_TABLES:
+                scans.append((table, detail))
+    return scans
+
+
+@pytest.mark.parametrize("sql, params", [q[1:] for q in QUERIES], ids=[q[0] for q in QUERIES])
+def test_hot_query_uses_index_search(sql, params):
+    plan = query_plan(sql, params)
+    assert not scanned_hot_tables(plan), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+@pytest.mark.parametrize("sql, params, index", [q[1:] for q in ORDERED_LISTINGS],
+                         ids=[q[0] for q in ORDERED_LISTINGS])
+def test_listing_walks_its_index_in_order(sql, params, index):
+    plan = query_plan(sql, params)
+    scans = scanned_hot_tables(plan)
+    assert len(scans) == 1 and scans[0][1].endswith(f"USING INDEX {index}"), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
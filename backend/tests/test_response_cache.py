@@ -0,0 +1,43 @@
+"""Near-duplicate matching in the chatbot response cache"""
+
+from backend.services.response_cache import ResponseCache
+
+# Other cached questions, so "not" is a common (low-IDF) word as in real use
+CACHED_QUESTIONS = [
+    "why is my period not regular",
+    "i do not sleep well",
+    "is it normal to not have cramps",
+    "what should i not eat during periods",
+]
+
+
+def cache_with(question, answer="cached answer"):
+    cache = ResponseCache(max_size=10, ttl=None, similarity_threshold=0.85)
+    for other in CACHED_QUESTIONS:
+        cache.set(other, 'en', '', "other answer")
+    cache.set(question, 'en', '', answer)
+    return cache
+
+
+def test_rephrasing_with_same_content_words_is_served():
+    cache = cache_with("can i take hrt with pcos")
+    assert cache.get("PCOS: can I take HRT?", 'en', '') == "cached answer"
+    assert cache.get("can i take hrt with the pcos", 'en', '') == "cached answer"
+    assert cache.similar_hits == 2
+
+
+def test_negated_question_is_not_served():
+    cache = cache_with("can i take hrt with pcos")
+    assert cache.get("can i not take hrt with pcos", 'en', '') is None
+    assert cache.get("Can't I take HRT with PCOS?", 'en', '') is None
+    assert cache.get("can i never take hrt with pcos", 'en', '') is None
+
+
+def test_different_content_words_are_not_served():
+    cache = cache_with("can i take hrt with pcos")
+    assert cache.get("can i take hrt with endometriosis", 'en', '') is None
+
+
+def test_other_context_is_not_served():
+    cache = cache_with("can i take hrt with pcos")
+    assert cache.get("can i take hrt with pcos", 'en', 'other-context') is None
@@ -0,0 +1,60 @@
+"""Circuit breaker handling in the translation provider chain"""
+
+import asyncio
+
+import pytest
+
+from backend.services.translation_providers import (
+    CircuitBreaker, ProviderChain, StubProvider, TranslationProvider
+)
+
+
+class SlowProvider(TranslationProvider):
+    name = 'slow'
+
+    async def translate(self, texts, source_lang, target_lang):
+        await asyncio.sleep(10)
+        return list(texts)
+
+
+def half_open_chain():
+    chain = ProviderChain([SlowProvider()], failure_threshold=1, cooldown=0)
+    breaker = chain.breakers['slow']
+    breaker.record_failure()
+    assert breaker.state == 'half-open'
+    return chain, breaker
+
+
+def test_cancelled_trial_frees_the_half_open_slot():
+    chain, breaker = half_open_chain()
+
+    async def cancel_trial():
+        task = asyncio.create_task(chain.translate(["hello"], 'en', 'hi'))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(cancel_trial())
+    assert breaker.allow()
+
+
+def test_only_one_trial_while_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_stub_output_is_not_authoritative():
+    assert not StubProvider(executor=None, timeout=1).authoritative
+
+
+def test_provider_without_translate_fails_on_creation():
+    class Incomplete(TranslationProvider):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,38 @@
+"""Background pre-warming must not take the slots request-path translation uses"""
+
+import asyncio
+
+from backend.services.translation_service import translation_service
+
+
+def test_prewarm_does_not_block_foreground_translation(monkeypatch):
+    async def scenario():
+        background_blocked = asyncio.Event()
+
+        async def fake_batch(texts, source_lang, target_lang, provisional=None):
+            if texts[0].startswith("background"):
+                await background_blocked.wait()
+            return [f"{target_lang}: {text}" for text in texts]
+
+        monkeypatch.setattr(translation_service, 'translate_batch', fake_batch)
+        monkeypatch.setattr(translation_service, '_translation_slots', asyncio.Semaphore(5))
+        monkeypatch.setattr(translation_service, '_prewarm_slots', asyncio.Semaphore(1))
+
+        # Far more background groups than there are foreground slots
+        background = [
+            asyncio.create_task(translation_service.translate_many(
+                [(f"background {i}", 'en', lang) for lang in ('hi', 'ta', 'kn')],
+                slots=translation_service._prewarm_slots
+            ))
+            for i in range(10)
+        ]
+        await asyncio.sleep(0)
+
+        foreground = await asyncio.wait_for(
+            translation_service.translate_many([("feed post", 'en', 'hi')]), timeout=1
+        )
+        background_blocked.set()
+        await asyncio.gather(*background)
+        return foreground
+
+    assert asyncio.run(scenario()) == {("feed post", 'en', 'hi'): "hi: feed post"}
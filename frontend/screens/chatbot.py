@@ -10,8 +10,11 @@ from kivy.uix.textinput import TextInput
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
 from kivy.app import App
+from kivy.clock import Clock
 import sys
 import os
+import json
+import threading
 import requests
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -172,6 +175,7 @@ class ChatbotScreen(Screen):
             color=(0.3, 0.7, 0.4, 1)
         )
         msg_layout.add_widget(msg)
+        msg_layout.message = msg  # Updated in place while an answer streams in
 
         # Spacer
         msg_layout.add_widget(Label(size_hint=(0.1, 1)))
@@ -196,18 +200,31 @@ class ChatbotScreen(Screen):
         # Clear input
         self.message_input.text = ""
 
-        # Get response from LLM-powered backend
-        response = self.get_api_response(message)
-
-        # Add bot response
-        bot_msg = self.create_bot_message(response)
+        # Add a bot bubble that fills in as the answer streams from the backend
+        bot_msg = self.create_bot_message("...")
         self.chat_layout.add_widget(bot_msg)
 
         # Scroll to bottom
         self.chat_scroll.scroll_y = 0
 
-    def get_api_response(self, message):
-        """Get AI-powered response from backend"""
+        # Fetch off the UI thread so the screen stays responsive
+        threading.Thread(
+            target=self.fetch_response, args=(message, bot_msg.message), daemon=True
+        ).start()
+
+    def fetch_response(self, message, label):
+        """Stream the answer into the bot bubble (runs in a worker thread)"""
+        def show(text):
+            Clock.schedule_once(lambda dt: setattr(label, 'text', text))
+
+        answer = self.get_api_response(message, on_token=show)
+        show(answer)
+
+    def get_api_response(self, message, on_token=None):
+        """
+        Get AI-powered response from backend
+        The answer is streamed; on_token receives the text received so far
+        """
         try:
             # Get app instance
             app = App.get_running_app()
@@ -217,30 +234,41 @@ class ChatbotScreen(Screen):
             if not user_id:
                 return "Please login to use the chatbot."
 
-            # Call backend API
+            # Call backend streaming API (server-sent events)
             response = requests.post(
-                f"{API_BASE_URL}/chat/ask",
+                f"{API_BASE_URL}/chat/ask/stream",
                 params={"user_id": user_id},
                 json={
                     "question": message,
                     "language": current_lang
                 },
+                stream=True,
                 timeout=15
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                answer = data.get('answer', '')
-                ai_powered = data.get('ai_powered', False)
-
-                # Add AI badge if powered by LLM
-                if ai_powered:
-                    answer = f"🤖 {answer}"
-
-                return answer
-            else:
+            if response.status_code != 200:
                 return "Sorry, I couldn't process your request. Please try again."
 
+            partial = ''
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith('event:'):
+                    event = line[len('event:'):].strip()
+                elif line.startswith('data:'):
+                    data = json.loads(line[len('data:'):])
+                    if event == 'token':
+                        partial += data.get('text', '')
+                        if on_token:
+                            on_token(partial)
+                    elif event == 'done':
+                        answer = data.get('answer', partial)
+                        # Add AI badge if powered by LLM
+                        if data.get('ai_powered', False):
+                            answer = f"🤖 {answer}"
+                        return answer
+
+            return partial or self.get_simple_response(message)
+
         except Exception as e:
             print(f"Error getting chatbot response: {e}")
             # Fallback to simple response
@@ -398,9 +398,12 @@ class CommunityScreen(Screen):
 
     def show_comments(self, post_id):
         """Show comments for a post"""
+        app = App.get_running_app()
+        user_lang = app.get_user_language() if app.user_language else 'en'
         try:
             response = requests.get(
                 f"{API_BASE_URL}/community/posts/{post_id}/comments",
+                params={"user_lang": user_lang},
                 timeout=3
             )
 
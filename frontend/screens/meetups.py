@@ -245,9 +245,13 @@ class MeetupsScreen(Screen):
 
         # Try to fetch real meetups from backend
         try:
+            user_lang = app.get_user_language() if app.user_language else 'en'
+            params = {"user_lang": user_lang}
+            if user_id:
+                params["user_id"] = user_id
             response = requests.get(
                 f"{API_BASE_URL}/meetups/list",
-                params={"user_id": user_id} if user_id else {},
+                params=params,
                 timeout=3
             )
 
@@ -635,7 +639,7 @@ class MeetupsScreen(Screen):
         # Title input
         form_content.add_widget(Label(text=get_text('meetups.title_placeholder'), size_hint_y=None, height=30))
         title_input = TextInput(
-            text=str(meetup.get('title', '')),
+            text=str(meetup.get('original_title', meetup.get('title', ''))),
             hint_text=get_text('meetups.title_placeholder'),
             multiline=False,
             size_hint_y=None,
@@ -646,7 +650,7 @@ class MeetupsScreen(Screen):
         # Description input
         form_content.add_widget(Label(text=get_text('meetups.description'), size_hint_y=None, height=30))
         desc_input = TextInput(
-            text=str(meetup.get('description') or ''),
+            text=str(meetup.get('original_description', meetup.get('description')) or ''),
             hint_text=get_text('meetups.desc_placeholder'),
             multiline=True,
             size_hint_y=None,